@@ -0,0 +1,273 @@
+"""Payloads served by the mock server.
+
+Recorded payloads in ``benchmarks/fixtures/`` (see ``record_fixtures.py``)
+are used when present. Otherwise a full season with real-sized payloads is
+synthesized. It is deterministic for a given day, and its rounds are spread
+around today so that about half the season has been run.
+"""
+import datetime
+import json
+from pathlib import Path
+import random
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+NAMES = (
+    "schedule",
+    "season_results",
+    "sprint_results",
+    "qualifying",
+    "driver_standings",
+    "constructor_standings",
+    "forecast",
+)
+
+ROUNDS = 24
+SPRINT_ROUNDS = (5, 6, 11, 19, 21, 23)
+
+CIRCUITS = (
+    ("bahrain", "Bahrain International Circuit", "Sakhir", "Bahrain", "26.0325", "50.5106"),
+    ("jeddah", "Jeddah Corniche Circuit", "Jeddah", "Saudi Arabia", "21.6319", "39.1044"),
+    ("albert_park", "Albert Park Grand Prix Circuit", "Melbourne", "Australia", "-37.8497", "144.968"),
+    ("suzuka", "Suzuka Circuit", "Suzuka", "Japan", "34.8431", "136.541"),
+    ("shanghai", "Shanghai International Circuit", "Shanghai", "China", "31.3389", "121.22"),
+    ("miami", "Miami International Autodrome", "Miami", "USA", "25.9581", "-80.2389"),
+    ("imola", "Autodromo Enzo e Dino Ferrari", "Imola", "Italy", "44.3439", "11.7167"),
+    ("monaco", "Circuit de Monaco", "Monte-Carlo", "Monaco", "43.7347", "7.42056"),
+    ("villeneuve", "Circuit Gilles Villeneuve", "Montreal", "Canada", "45.5", "-73.5228"),
+    ("catalunya", "Circuit de Barcelona-Catalunya", "Montmeló", "Spain", "41.57", "2.26111"),
+    ("red_bull_ring", "Red Bull Ring", "Spielberg", "Austria", "47.2197", "14.7647"),
+    ("silverstone", "Silverstone Circuit", "Silverstone", "UK", "52.0786", "-1.01694"),
+    ("hungaroring", "Hungaroring", "Budapest", "Hungary", "47.5789", "19.2486"),
+    ("spa", "Circuit de Spa-Francorchamps", "Spa", "Belgium", "50.4372", "5.97139"),
+    ("zandvoort", "Circuit Park Zandvoort", "Zandvoort", "Netherlands", "52.3888", "4.54092"),
+    ("monza", "Autodromo Nazionale di Monza", "Monza", "Italy", "45.6156", "9.28111"),
+    ("baku", "Baku City Circuit", "Baku", "Azerbaijan", "40.3725", "49.8533"),
+    ("marina_bay", "Marina Bay Street Circuit", "Marina Bay", "Singapore", "1.2914", "103.864"),
+    ("americas", "Circuit of the Americas", "Austin", "USA", "30.1328", "-97.6411"),
+    ("rodriguez", "Autódromo Hermanos Rodríguez", "Mexico City", "Mexico", "19.4042", "-99.0907"),
+    ("interlagos", "Autódromo José Carlos Pace", "São Paulo", "Brazil", "-23.7036", "-46.6997"),
+    ("vegas", "Las Vegas Strip Street Circuit", "Las Vegas", "United States", "36.1147", "-115.173"),
+    ("losail", "Losail International Circuit", "Al Daayen", "Qatar", "25.49", "51.4542"),
+    ("yas_marina", "Yas Marina Circuit", "Abu Dhabi", "UAE", "24.4672", "54.6031"),
+)
+
+POINTS = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+SPRINT_POINTS = (8, 7, 6, 5, 4, 3, 2, 1)
+STATUSES = ("Finished", "+1 Lap", "+2 Laps", "Collision", "Engine", "Retired")
+SYMBOLS = ("clearsky_day", "fair_day", "partlycloudy_day", "cloudy", "lightrainshowers_day", "rain")
+
+
+def load_fixtures(today=None):
+    """Return ``{name: payload}``, recorded if available, else synthesized."""
+    if all((FIXTURE_DIR / f"{name}.json").exists() for name in NAMES):
+        return {name: json.loads((FIXTURE_DIR / f"{name}.json").read_text()) for name in NAMES}
+    return synthesize(today)
+
+
+def _mrdata(table_key, table, total):
+    return {
+        "MRData": {
+            "xmlns": "",
+            "series": "f1",
+            "url": "http://api.jolpi.ca/ergast/f1/current.json",
+            "limit": "30",
+            "offset": "0",
+            "total": str(total),
+            table_key: table,
+        }
+    }
+
+
+def _slot(day, hour):
+    return {"date": day.isoformat(), "time": f"{hour:02d}:00:00Z"}
+
+
+def synthesize(today=None):
+    today = today or datetime.datetime.now(datetime.timezone.utc).date()
+    rng = random.Random(today.toordinal())
+    season = str(today.year)
+    # Race 12 falls on the last Sunday before today.
+    anchor = today - datetime.timedelta(days=(today.weekday() + 1) % 7 or 7) - datetime.timedelta(weeks=22)
+
+    drivers = [
+        {
+            "driverId": f"driver_{i}",
+            "permanentNumber": str(i + 2),
+            "code": f"D{i:02d}",
+            "url": f"http://en.wikipedia.org/wiki/Driver_{i}",
+            "givenName": f"Given{i}",
+            "familyName": f"Family{i}",
+            "dateOfBirth": f"199{i % 10}-0{i % 9 + 1}-1{i % 9}",
+            "nationality": rng.choice(("Dutch", "British", "Monegasque", "Spanish", "Australian")),
+        }
+        for i in range(20)
+    ]
+    teams = [
+        {
+            "constructorId": f"team_{i}",
+            "url": f"http://en.wikipedia.org/wiki/Team_{i}",
+            "name": f"Team {i}",
+            "nationality": rng.choice(("Austrian", "British", "Italian", "German", "Swiss")),
+        }
+        for i in range(10)
+    ]
+
+    races = []
+    for r in range(1, ROUNDS + 1):
+        circuit_id, name, locality, country, lat, long = CIRCUITS[r - 1]
+        sunday = anchor + datetime.timedelta(weeks=2 * (r - 1))
+        friday, saturday = sunday - datetime.timedelta(days=2), sunday - datetime.timedelta(days=1)
+        race = {
+            "season": season,
+            "round": str(r),
+            "url": f"https://en.wikipedia.org/wiki/{season}_{country}_Grand_Prix",
+            "raceName": f"{country} Grand Prix",
+            "Circuit": {
+                "circuitId": circuit_id,
+                "url": f"http://en.wikipedia.org/wiki/{circuit_id}",
+                "circuitName": name,
+                "Location": {"lat": lat, "long": long, "locality": locality, "country": country},
+            },
+            **_slot(sunday, 13),
+            "FirstPractice": _slot(friday, 11),
+        }
+        if r in SPRINT_ROUNDS:
+            race["SprintQualifying"] = _slot(friday, 15)
+            race["Sprint"] = _slot(saturday, 10)
+        else:
+            race["SecondPractice"] = _slot(friday, 15)
+            race["ThirdPractice"] = _slot(saturday, 10)
+        race["Qualifying"] = _slot(saturday, 14)
+        races.append(race)
+
+    def _order():
+        order = list(range(20))
+        rng.shuffle(order)
+        return order
+
+    def _result(position, i, points):
+        status = "Finished" if position <= 14 else rng.choice(STATUSES)
+        row = {
+            "number": drivers[i]["permanentNumber"],
+            "position": str(position),
+            "positionText": str(position) if status != "Retired" else "R",
+            "points": str(points[position - 1]) if position <= len(points) else "0",
+            "Driver": drivers[i],
+            "Constructor": teams[i // 2],
+            "grid": str(rng.randint(1, 20)),
+            "laps": str(57 - (status != "Finished") * rng.randint(1, 20)),
+            "status": status,
+        }
+        if status == "Finished":
+            millis = 5_400_000 + position * 4_321
+            row["Time"] = {"millis": str(millis), "time": f"+{position * 4.321:.3f}"}
+        row["FastestLap"] = {
+            "rank": str(position),
+            "lap": str(rng.randint(30, 57)),
+            "Time": {"time": f"1:3{rng.randint(0, 9)}.{rng.randint(0, 999):03d}"},
+            "AverageSpeed": {"units": "kph", "speed": f"{rng.uniform(200, 240):.3f}"},
+        }
+        return row
+
+    now = datetime.datetime.combine(today, datetime.time(12), datetime.timezone.utc)
+    results, sprints, qualifying = [], [], []
+    points = {i: 0 for i in range(20)}
+    for race in races:
+        base = {k: race[k] for k in ("season", "round", "url", "raceName", "Circuit", "date", "time")}
+        quali_start = datetime.datetime.fromisoformat(
+            f"{race['Qualifying']['date']}T{race['Qualifying']['time']}".replace("Z", "+00:00")
+        )
+        race_start = datetime.datetime.fromisoformat(f"{race['date']}T{race['time']}".replace("Z", "+00:00"))
+        if quali_start + datetime.timedelta(hours=1) < now:
+            qualifying.append({**base, "QualifyingResults": [
+                {
+                    "number": drivers[i]["permanentNumber"],
+                    "position": str(p),
+                    "Driver": drivers[i],
+                    "Constructor": teams[i // 2],
+                    "Q1": f"1:2{rng.randint(0, 9)}.{rng.randint(0, 999):03d}",
+                    "Q2": f"1:2{rng.randint(0, 9)}.{rng.randint(0, 999):03d}" if p <= 15 else "",
+                    "Q3": f"1:2{rng.randint(0, 9)}.{rng.randint(0, 999):03d}" if p <= 10 else "",
+                }
+                for p, i in enumerate(_order(), 1)
+            ]})
+        if "Sprint" in race and race_start - datetime.timedelta(days=1) < now:
+            order = _order()
+            sprints.append({**base, "SprintResults": [_result(p, i, SPRINT_POINTS) for p, i in enumerate(order, 1)]})
+            for p, i in enumerate(order, 1):
+                points[i] += SPRINT_POINTS[p - 1] if p <= len(SPRINT_POINTS) else 0
+        if race_start + datetime.timedelta(hours=2) < now:
+            order = _order()
+            results.append({**base, "Results": [_result(p, i, POINTS) for p, i in enumerate(order, 1)]})
+            for p, i in enumerate(order, 1):
+                points[i] += POINTS[p - 1] if p <= len(POINTS) else 0
+
+    last_round = results[-1]["round"] if results else "0"
+    ranking = sorted(points, key=points.get, reverse=True)
+    team_points = {t: points[2 * t] + points[2 * t + 1] for t in range(10)}
+    team_ranking = sorted(team_points, key=team_points.get, reverse=True)
+
+    start = datetime.datetime.combine(today, datetime.time(now.hour), datetime.timezone.utc)
+    timeseries = []
+    for h in list(range(60)) + list(range(60, 240, 6)):
+        time = start + datetime.timedelta(hours=h)
+        block = {"summary": {"symbol_code": rng.choice(SYMBOLS)}, "details": {"precipitation_amount": round(rng.uniform(0, 2), 1)}}
+        data = {
+            "instant": {"details": {
+                "air_pressure_at_sea_level": round(rng.uniform(995, 1030), 1),
+                "air_temperature": round(rng.uniform(10, 32), 1),
+                "cloud_area_fraction": round(rng.uniform(0, 100), 1),
+                "relative_humidity": round(rng.uniform(30, 95), 1),
+                "wind_from_direction": round(rng.uniform(0, 360), 1),
+                "wind_speed": round(rng.uniform(0, 12), 1),
+            }},
+            "next_6_hours": block,
+            "next_12_hours": {"summary": block["summary"], "details": {}},
+        }
+        if h < 60:
+            data["next_1_hours"] = block
+        timeseries.append({"time": time.strftime("%Y-%m-%dT%H:%M:%SZ"), "data": data})
+
+    return {
+        "schedule": _mrdata("RaceTable", {"season": season, "Races": races}, len(races)),
+        "season_results": _mrdata("RaceTable", {"season": season, "Races": results}, 20 * len(results)),
+        "sprint_results": _mrdata("RaceTable", {"season": season, "Races": sprints}, 20 * len(sprints)),
+        "qualifying": _mrdata("RaceTable", {"season": season, "Races": qualifying}, 20 * len(qualifying)),
+        "driver_standings": _mrdata("StandingsTable", {"season": season, "round": last_round, "StandingsLists": [{
+            "season": season,
+            "round": last_round,
+            "DriverStandings": [
+                {
+                    "position": str(p),
+                    "positionText": str(p),
+                    "points": str(points[i]),
+                    "wins": str(rng.randint(0, 5)),
+                    "Driver": drivers[i],
+                    "Constructors": [teams[i // 2]],
+                }
+                for p, i in enumerate(ranking, 1)
+            ],
+        }]}, 20),
+        "constructor_standings": _mrdata("StandingsTable", {"season": season, "round": last_round, "StandingsLists": [{
+            "season": season,
+            "round": last_round,
+            "ConstructorStandings": [
+                {
+                    "position": str(p),
+                    "positionText": str(p),
+                    "points": str(team_points[t]),
+                    "wins": str(rng.randint(0, 5)),
+                    "Constructor": teams[t],
+                }
+                for p, t in enumerate(team_ranking, 1)
+            ],
+        }]}, 10),
+        "forecast": {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [0.0, 0.0, 10]},
+            "properties": {
+                "meta": {"updated_at": start.strftime("%Y-%m-%dT%H:%M:%SZ"), "units": {"air_temperature": "celsius"}},
+                "timeseries": timeseries,
+            },
+        },
+    }
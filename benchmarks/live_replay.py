@@ -0,0 +1,295 @@
+"""File-based stand-in for the F1 live timing SignalR feed.
+
+Replays a recording over the same negotiate/connect/Subscribe handshake as
+``livetiming.formula1.com/signalr``, as timed feed messages. The replay
+clock starts with the server, so a client connecting late gets every
+message up to now at once, then the rest in (scaled) real time.
+
+    python -m benchmarks.live_replay serve [recording.jsonl] --port 8090 --speed 10
+    python -m benchmarks.live_replay fetch 2024/2024-03-02_Bahrain_Grand_Prix/2024-03-02_Race/ race.jsonl
+
+A recording has one ``[seconds, topic, data]`` line per message. ``fetch``
+builds one from the public archive of a past session; without a recording
+a short race is synthesized.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+from pathlib import Path
+import random
+import time
+
+import aiohttp
+from aiohttp import web
+
+ARCHIVE_URL = "https://livetiming.formula1.com/static/{path}{topic}.jsonStream"
+TOPICS = (
+    "SessionInfo",
+    "SessionStatus",
+    "DriverList",
+    "LapCount",
+    "TimingData",
+    "TrackStatus",
+    "RaceControlMessages",
+    "Heartbeat",
+)
+KEEPALIVE = 5.0
+TEAMS = ("Red Bull Racing", "Ferrari", "Mercedes", "McLaren", "Aston Martin",
+         "Alpine", "Williams", "RB", "Kick Sauber", "Haas F1 Team")
+
+
+def load_recording(path):
+    with open(path, encoding="utf-8") as file:
+        return [tuple(json.loads(line)) for line in file if line.strip()]
+
+
+def save_recording(events, path):
+    with open(path, "w", encoding="utf-8") as file:
+        for event in events:
+            file.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+def _lap_time(seconds):
+    return f"{int(seconds // 60)}:{seconds % 60:06.3f}"
+
+
+def synthesize(laps=10, lap_time=6.0, drivers=20, seed=0):
+    """A race of ``laps`` laps of ``lap_time`` replay seconds, with flags and overtakes."""
+    rng = random.Random(seed)
+    numbers = [str(n) for n in rng.sample(range(1, 99), drivers)]
+    events = [
+        (0.0, "SessionInfo", {
+            "Meeting": {"Name": "Synthetic Grand Prix", "Location": "Nowhere"},
+            "Type": "Race",
+            "Name": "Race",
+        }),
+        (0.0, "SessionStatus", {"Status": "Started"}),
+        (0.0, "DriverList", {
+            number: {
+                "RacingNumber": number,
+                "Tla": f"D{i:02d}",
+                "FullName": f"Driver {i}",
+                "TeamName": TEAMS[i // 2 % len(TEAMS)],
+            }
+            for i, number in enumerate(numbers)
+        }),
+        (0.0, "TimingData", {"Lines": {
+            number: {
+                "Position": str(i + 1),
+                "GapToLeader": "",
+                "IntervalToPositionAhead": {"Value": ""},
+                "NumberOfLaps": 0,
+                "LastLapTime": {"Value": ""},
+                "Sectors": [{"Value": ""}, {"Value": ""}, {"Value": ""}],
+                "InPit": False,
+                "Retired": False,
+            }
+            for i, number in enumerate(numbers)
+        }}),
+        (0.0, "LapCount", {"CurrentLap": 1, "TotalLaps": laps}),
+        (0.0, "TrackStatus", {"Status": "1", "Message": "AllClear"}),
+        (0.0, "RaceControlMessages", {"Messages": [
+            {"Utc": "", "Category": "Flag", "Flag": "GREEN", "Message": "GREEN LIGHT - PIT EXIT OPEN"}
+        ]}),
+    ]
+
+    order = list(numbers)
+    gaps = {number: i * 1.1 for i, number in enumerate(numbers)}
+    messages = 1
+    flags = {
+        3: ("2", "Yellow", "YELLOW IN TRACK SECTOR 7"),
+        5: ("4", "SCDeployed", "SAFETY CAR DEPLOYED"),
+        7: ("1", "AllClear", "TRACK CLEAR"),
+    }
+    for lap in range(1, laps + 1):
+        start = (lap - 1) * lap_time
+        for i, number in enumerate(order):
+            offset = i * lap_time / drivers / 2
+            sector_times = [rng.uniform(28, 34) for _ in range(3)]
+            for sector, value in enumerate(sector_times):
+                events.append((start + offset + (sector + 1) * lap_time / 3 * 0.98, "TimingData", {
+                    "Lines": {number: {"Sectors": {str(sector): {"Value": f"{value:.3f}"}}}}
+                }))
+            gaps[number] += rng.uniform(-0.3, 0.5) if i else 0
+            events.append((start + offset + lap_time * 0.99, "TimingData", {"Lines": {number: {
+                "NumberOfLaps": lap,
+                "LastLapTime": {"Value": _lap_time(sum(sector_times))},
+                "GapToLeader": f"+{gaps[number]:.3f}" if i else f"LAP {lap}",
+                "IntervalToPositionAhead": {
+                    "Value": f"+{max(gaps[number] - gaps[order[i - 1]], 0.1):.3f}" if i else ""
+                },
+            }}}))
+        # A couple of overtakes per lap.
+        for _ in range(2):
+            i = rng.randrange(1, drivers)
+            order[i - 1], order[i] = order[i], order[i - 1]
+            gaps[order[i - 1]], gaps[order[i]] = gaps[order[i]], gaps[order[i - 1]]
+            events.append((start + lap_time * rng.random(), "TimingData", {"Lines": {
+                order[i - 1]: {"Position": str(i)},
+                order[i]: {"Position": str(i + 1)},
+            }}))
+        if lap in flags:
+            status, message, text = flags[lap]
+            events.append((start + 1, "TrackStatus", {"Status": status, "Message": message}))
+            events.append((start + 1, "RaceControlMessages", {"Messages": {
+                str(messages): {"Utc": "", "Lap": lap, "Category": "Flag", "Flag": message.upper(), "Message": text}
+            }}))
+            messages += 1
+        events.append((start + lap_time, "LapCount", {"CurrentLap": min(lap + 1, laps)}))
+    end = laps * lap_time
+    events.append((end, "SessionStatus", {"Status": "Finished"}))
+    events.extend((t, "Heartbeat", {"Utc": ""}) for t in range(0, int(end) + 1, 5))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+class ReplayServer:
+    """aiohttp application replaying ``events`` to every client that subscribes."""
+
+    def __init__(self, events=None, speed=1.0):
+        self.events = events if events is not None else synthesize()
+        self.speed = speed
+        self.stats = {"connections": 0, "messages": 0}
+        self._started = time.monotonic()
+        self.app = web.Application()
+        self.app.router.add_get("/signalr/negotiate", self._negotiate)
+        self.app.router.add_get("/signalr/connect", self._connect)
+        self.app.router.add_get("/_stats", self._stats)
+
+    def elapsed(self):
+        return (time.monotonic() - self._started) * self.speed
+
+    async def _negotiate(self, request):
+        response = web.json_response({
+            "Url": "/signalr",
+            "ConnectionToken": f"replay-{self.stats['connections']}",
+            "ConnectionId": str(self.stats["connections"]),
+            "KeepAliveTimeout": 20.0,
+            "DisconnectTimeout": 30.0,
+            "TryWebSockets": True,
+            "ProtocolVersion": "1.5",
+        })
+        response.set_cookie("AWSALBCORS", "replay")
+        return response
+
+    async def _stats(self, request):
+        return web.json_response({**self.stats, "elapsed": self.elapsed(), "events": len(self.events)})
+
+    async def _connect(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats["connections"] += 1
+        subscribed = None
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                break
+            call = json.loads(msg.data)
+            if call.get("M") == "Subscribe":
+                subscribed = set(call["A"][0])
+                # Nothing is known before the first message; it is replayed below.
+                await ws.send_json({"R": {}, "I": str(call.get("I"))})
+                break
+        if subscribed is not None:
+            try:
+                await self._replay(ws, subscribed)
+            except ConnectionResetError:
+                # The client went away.
+                pass
+        await ws.close()
+        return ws
+
+    async def _replay(self, ws, topics):
+        i = 0
+        while i < len(self.events) and not ws.closed:
+            now = self.elapsed()
+            batch = []
+            while i < len(self.events) and self.events[i][0] <= now:
+                t, topic, data = self.events[i]
+                i += 1
+                if topic in topics:
+                    stamp = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+                    batch.append({"H": "Streaming", "M": "feed", "A": [topic, data, stamp]})
+            if batch:
+                self.stats["messages"] += len(batch)
+                await ws.send_json({"C": f"d-{i}", "M": batch})
+            if i < len(self.events):
+                wait = (self.events[i][0] - self.elapsed()) / self.speed
+                if wait > KEEPALIVE:
+                    await ws.send_json({})
+                await asyncio.sleep(min(max(wait, 0), KEEPALIVE))
+        # Stay connected after the end, sending keepalives like the real feed.
+        while not ws.closed:
+            await ws.send_json({})
+            await asyncio.sleep(KEEPALIVE)
+
+    async def async_start(self, host="127.0.0.1", port=0):
+        """Start serving; returns the SignalR base URL."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/signalr"
+
+    async def async_stop(self):
+        await self._runner.cleanup()
+
+
+def _parse_offset(value):
+    hours, minutes, seconds = value.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+async def fetch_archive(path, out):
+    """Build a recording from the archived ``.jsonStream`` files of a past session."""
+    events = []
+    async with aiohttp.ClientSession() as session:
+        for topic in TOPICS:
+            async with session.get(ARCHIVE_URL.format(path=path, topic=topic)) as resp:
+                if resp.status == 404:
+                    continue
+                resp.raise_for_status()
+                text = (await resp.read()).decode("utf-8-sig")
+            for line in text.splitlines():
+                # Lines look like "00:01:02.345{...}".
+                start = line.find("{")
+                if start > 0:
+                    events.append((_parse_offset(line[:start]), topic, json.loads(line[start:])))
+    events.sort(key=lambda event: event[0])
+    save_recording(events, out)
+    print(f"{out}: {len(events)} messages over {events[-1][0] if events else 0:.0f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="replay a recording")
+    serve.add_argument("recording", nargs="?", type=Path)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8090)
+    serve.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    fetch = commands.add_parser("fetch", help="record a past session from the archive")
+    fetch.add_argument("path", help="archive path, e.g. 2024/2024-03-02_Bahrain_Grand_Prix/2024-03-02_Race/")
+    fetch.add_argument("out", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "fetch":
+        asyncio.run(fetch_archive(args.path, args.out))
+        return
+
+    server = ReplayServer(load_recording(args.recording) if args.recording else None, args.speed)
+
+    async def _serve():
+        url = await server.async_start(args.host, args.port)
+        print(f"Serving on {url}", flush=True)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Local stand-in for the Jolpica-F1 (Ergast) and met.no APIs.
+
+Serves the benchmark fixtures on the same paths as the real services, with
+Ergast-style pagination and per-round filtering, ``ETag``/``Last-Modified``
+validators answered with 304s, an ``Expires`` header on forecasts, and
+optional injected latency, server errors and 429 rate limiting.
+
+Run standalone with ``python -m benchmarks.mock_server --port 8080``.
+"""
+import argparse
+import asyncio
+import copy
+import datetime
+from email.utils import format_datetime
+import hashlib
+import json
+import random
+
+from aiohttp import web
+
+from .fixtures import load_fixtures
+
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+# Fixture -> key of the per-race rows that pagination counts.
+ROW_KEYS = {
+    "schedule": None,
+    "season_results": "Results",
+    "sprint_results": "SprintResults",
+    "qualifying": "QualifyingResults",
+}
+
+
+class MockServer:
+    """aiohttp application serving the fixtures, with fault injection.
+
+    ``latency`` and ``jitter`` are in seconds; ``error_rate`` is the share of
+    requests answered with a 503 and ``throttle_rate`` the share answered
+    with a 429 carrying a ``Retry-After`` of ``retry_after`` seconds. With
+    ``etags`` disabled every request gets a full 200 body.
+    """
+
+    def __init__(
+        self, fixtures=None, latency=0.0, jitter=0.0, error_rate=0.0, etags=True, seed=0,
+        throttle_rate=0.0, retry_after=1,
+    ):
+        self.fixtures = fixtures or load_fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.etags = etags
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self.stats = {"requests": 0, "not_modified": 0, "errors": 0, "throttled": 0, "bytes": 0}
+        self.paths = {}
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get("/_stats", self._stats)
+        self.app.router.add_get("/ergast/f1/current.json", self._schedule)
+        self.app.router.add_get("/ergast/f1/current/driverstandings.json", self._fixture("driver_standings"))
+        self.app.router.add_get(
+            "/ergast/f1/current/constructorstandings.json", self._fixture("constructor_standings")
+        )
+        self.app.router.add_get("/ergast/f1/current/last/results.json", self._last_results)
+        self.app.router.add_get("/ergast/f1/current/results.json", self._season("season_results"))
+        self.app.router.add_get("/ergast/f1/current/sprint.json", self._season("sprint_results"))
+        self.app.router.add_get("/ergast/f1/current/qualifying.json", self._season("qualifying"))
+        self.app.router.add_get("/ergast/f1/current/{round}/results.json", self._round("season_results"))
+        self.app.router.add_get("/ergast/f1/current/{round}/sprint.json", self._round("sprint_results"))
+        self.app.router.add_get("/ergast/f1/current/{round}/qualifying.json", self._round("qualifying"))
+        self.app.router.add_get("/weatherapi/locationforecast/2.0/compact", self._forecast)
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path == "/_stats":
+            return await handler(request)
+        self.stats["requests"] += 1
+        self.paths[request.path_qs] = self.paths.get(request.path_qs, 0) + 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.Response(status=503, text="injected error")
+        if self.throttle_rate and self._random.random() < self.throttle_rate:
+            self.stats["throttled"] += 1
+            return web.Response(status=429, text="slow down", headers={"Retry-After": str(self.retry_after)})
+        return await handler(request)
+
+    def _respond(self, request, payload, headers=None):
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        if self.etags:
+            headers.update({"ETag": etag, "Last-Modified": LAST_MODIFIED})
+            if request.headers.get("If-None-Match") == etag:
+                self.stats["not_modified"] += 1
+                return web.Response(status=304, headers=headers)
+        self.stats["bytes"] += len(body)
+        return web.Response(body=body, headers=headers)
+
+    async def _stats(self, request):
+        return web.json_response({**self.stats, "paths": self.paths})
+
+    def _fixture(self, name):
+        async def handler(request):
+            return self._respond(request, self.fixtures[name])
+        return handler
+
+    async def _schedule(self, request):
+        return self._respond(request, self._page(request, "schedule"))
+
+    async def _last_results(self, request):
+        payload = copy.copy(self.fixtures["season_results"]["MRData"])
+        races = payload["RaceTable"]["Races"]
+        payload["RaceTable"] = {**payload["RaceTable"], "Races": races[-1:]}
+        payload["total"] = str(len(races[-1]["Results"]) if races else 0)
+        return self._respond(request, {"MRData": payload})
+
+    def _season(self, name):
+        async def handler(request):
+            return self._respond(request, self._page(request, name))
+        return handler
+
+    def _round(self, name):
+        async def handler(request):
+            races = [
+                race for race in self.fixtures[name]["MRData"]["RaceTable"]["Races"]
+                if race["round"] == request.match_info["round"]
+            ]
+            return self._respond(request, self._page(request, name, races))
+        return handler
+
+    def _page(self, request, name, races=None):
+        """Slice ``races`` by rows like Ergast: ``limit`` (default 30, max 100) and ``offset``."""
+        mrdata = self.fixtures[name]["MRData"]
+        if races is None:
+            races = mrdata["RaceTable"]["Races"]
+        limit = min(int(request.query.get("limit", 30)), 100)
+        offset = int(request.query.get("offset", 0))
+        key = ROW_KEYS[name]
+        if key is None:
+            page, total = races[offset:offset + limit], len(races)
+        else:
+            rows = [(race, row) for race in races for row in race[key]]
+            total = len(rows)
+            page = []
+            for race, row in rows[offset:offset + limit]:
+                if not page or page[-1]["round"] != race["round"]:
+                    page.append({**race, key: []})
+                page[-1][key].append(row)
+        return {"MRData": {
+            **mrdata,
+            "limit": str(limit),
+            "offset": str(offset),
+            "total": str(total),
+            "RaceTable": {**mrdata["RaceTable"], "Races": page},
+        }}
+
+    async def _forecast(self, request):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        expires = format_datetime(now + datetime.timedelta(minutes=30), usegmt=True)
+        return self._respond(request, self.fixtures["forecast"], {"Expires": expires})
+
+    async def async_start(self, host="127.0.0.1", port=0):
+        """Start serving; returns the base URL."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def async_stop(self):
+        await self._runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered with a 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of the 429s, in seconds")
+    parser.add_argument("--no-etags", action="store_true", help="never send validators or 304s")
+    args = parser.parse_args()
+
+    server = MockServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        etags=not args.no_etags,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+    )
+
+    async def _serve():
+        url = await server.async_start(args.host, args.port)
+        print(f"Serving on {url}", flush=True)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
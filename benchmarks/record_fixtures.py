@@ -0,0 +1,85 @@
+"""Record live payloads from Jolpica-F1 and met.no into ``benchmarks/fixtures/``.
+
+    python -m benchmarks.record_fixtures
+
+Paginated endpoints are fetched in full and merged into a single payload, so
+the mock server can paginate them again. Record mid-season for payloads of
+a representative size, and refresh the baseline afterwards.
+"""
+import asyncio
+import json
+
+import aiohttp
+
+from .fixtures import FIXTURE_DIR
+from .mock_server import ROW_KEYS
+
+ERGAST = "https://api.jolpi.ca/ergast/f1/current"
+ENDPOINTS = {
+    "schedule": f"{ERGAST}.json",
+    "season_results": f"{ERGAST}/results.json",
+    "sprint_results": f"{ERGAST}/sprint.json",
+    "qualifying": f"{ERGAST}/qualifying.json",
+    "driver_standings": f"{ERGAST}/driverstandings.json",
+    "constructor_standings": f"{ERGAST}/constructorstandings.json",
+}
+FORECAST_URL = "https://api.met.no/weatherapi/locationforecast/2.0/compact?lat={lat}&lon={lon}"
+USER_AGENT = "homeassistant-f1_sensor benchmarks"
+PAGE_LIMIT = 100
+
+
+async def _fetch_all(session, name, url):
+    """Fetch every page of ``url`` and merge the races, joining rounds split across pages."""
+    key = ROW_KEYS.get(name)
+    offset, races, payload = 0, [], None
+    while True:
+        async with session.get(url, params={"limit": PAGE_LIMIT, "offset": offset}) as resp:
+            resp.raise_for_status()
+            payload = await resp.json()
+        mrdata = payload["MRData"]
+        if "RaceTable" not in mrdata:
+            return payload
+        for race in mrdata["RaceTable"]["Races"]:
+            if key and races and races[-1]["round"] == race["round"]:
+                races[-1][key].extend(race[key])
+            else:
+                races.append(race)
+        offset += int(mrdata["limit"])
+        if offset >= int(mrdata["total"]):
+            break
+        # Jolpica allows a handful of requests per second.
+        await asyncio.sleep(0.5)
+    mrdata["RaceTable"]["Races"] = races
+    mrdata.update({"limit": str(PAGE_LIMIT), "offset": "0"})
+    return payload
+
+
+async def _record():
+    FIXTURE_DIR.mkdir(exist_ok=True)
+    async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
+        fixtures = {}
+        for name, url in ENDPOINTS.items():
+            fixtures[name] = await _fetch_all(session, name, url)
+            await asyncio.sleep(0.5)
+
+        # The forecast for the next race, as the weather sensor requests it.
+        races = fixtures["schedule"]["MRData"]["RaceTable"]["Races"]
+        done = {race["round"] for race in fixtures["season_results"]["MRData"]["RaceTable"]["Races"]}
+        race = next((r for r in races if r["round"] not in done), races[-1])
+        location = race["Circuit"]["Location"]
+        async with session.get(FORECAST_URL.format(lat=location["lat"], lon=location["long"])) as resp:
+            resp.raise_for_status()
+            fixtures["forecast"] = await resp.json()
+
+    for name, payload in fixtures.items():
+        path = FIXTURE_DIR / f"{name}.json"
+        path.write_text(json.dumps(payload))
+        print(f"{path}: {path.stat().st_size // 1024} KiB")
+
+
+def main():
+    asyncio.run(_record())
+
+
+if __name__ == "__main__":
+    main()
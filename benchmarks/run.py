@@ -0,0 +1,483 @@
+"""Benchmark the integration against the mock server and compare with a baseline.
+
+    python -m benchmarks.run                   # run, compare with baseline.json
+    python -m benchmarks.run --save-baseline   # run and store as the new baseline
+    python -m benchmarks.run --latency 0.05 --error-rate 0.1
+
+Measures, against a local mock of the Jolpica-F1 and met.no APIs:
+
+* ``micro.*``: JSON decode and model parse of every fixture, building each
+  dataset from the model, applying live timing deltas, and building the
+  season analytics in full and one round at a time.
+* ``setup.*``: wall time, requests and event-loop blocking of
+  ``async_setup_entry``, cold (empty cache) and warm (cached snapshots).
+* ``memory.*``: retained traced memory of the season payloads kept as decoded
+  dicts and as the model, and peak and retained traced memory of a warm setup.
+* ``sensor.*``: cost of reading ``state`` and ``extra_state_attributes``,
+  cold (projection just invalidated) and warm.
+* ``refresh.*``: CPU time of a coordinator refresh, revalidated (304s) and
+  full (validators dropped).
+
+Every metric is lower-is-better. Metrics more than ``--tolerance`` above the
+baseline are reported as regressions and make the run exit with status 1, as
+does a section fingerprint that misses a change to the entity's output.
+"""
+import argparse
+import asyncio
+from contextlib import contextmanager
+import gc
+import json
+import os
+from pathlib import Path
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .fixtures import load_fixtures
+from .live_replay import synthesize as synthesize_live
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).parent / "baseline.json"
+RESULTS = Path(__file__).parent / "results.json"
+
+ALL_SENSORS = [
+    "next_race",
+    "current_season",
+    "driver_standings",
+    "constructor_standings",
+    "weather",
+    "last_race_results",
+    "last_qualifying_results",
+    "season_results",
+    "sprint_results",
+    "race_week",
+    "points_progression",
+    "championship_gaps",
+    "teammate_head_to_head",
+    "title_fight",
+]
+
+# Callbacks running longer than this count as blocking the event loop; the
+# same threshold Home Assistant uses for its slow callback warnings.
+SLOW_CALLBACK = 0.1
+
+
+class LoopMonitor:
+    """Times every callback the event loop runs.
+
+    Only works with the default asyncio loop, not uvloop.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.max = 0.0
+        self.slow = 0
+        self.slow_time = 0.0
+
+    @contextmanager
+    def installed(self):
+        original = asyncio.events.Handle._run
+        monitor = self
+
+        def _run(handle):
+            started = time.perf_counter()
+            try:
+                return original(handle)
+            finally:
+                elapsed = time.perf_counter() - started
+                monitor.max = max(monitor.max, elapsed)
+                if elapsed >= SLOW_CALLBACK:
+                    monitor.slow += 1
+                    monitor.slow_time += elapsed
+
+        asyncio.events.Handle._run = _run
+        try:
+            yield self
+        finally:
+            asyncio.events.Handle._run = original
+
+    def report(self, prefix, results):
+        results[f"{prefix}.loop_max_ms"] = self.max * 1000
+        results[f"{prefix}.loop_slow_ms"] = self.slow_time * 1000
+
+
+class RedirectSession:
+    """Sends the integration's requests to the mock server instead of the real hosts."""
+
+    def __init__(self, session, base_url):
+        self._session = session
+        self._base_url = base_url
+
+    def _url(self, url):
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self._base_url}{parts.path}{query}"
+
+    def get(self, url, **kwargs):
+        return self._session.get(self._url(url), **kwargs)
+
+    def ws_connect(self, url, **kwargs):
+        return self._session.ws_connect(self._url(url), **kwargs)
+
+
+def _median_us(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def bench_micro(fixtures, repeat, results):
+    """Decode, parse and project every fixture outside Home Assistant's loop."""
+    from homeassistant.util.json import json_loads
+
+    from custom_components.f1_sensor import datasets
+    from custom_components.f1_sensor.analytics import SeasonAnalytics
+    from custom_components.f1_sensor.live import LiveSession
+    from custom_components.f1_sensor.model import RaceTable, StandingsTable
+    from custom_components.f1_sensor.schedule import ScheduleIndex
+    from custom_components.f1_sensor.weather import Forecast
+
+    parsers = {
+        "driver_standings": StandingsTable.from_payload,
+        "constructor_standings": StandingsTable.from_payload,
+        "forecast": Forecast.from_data,
+    }
+    projections = {
+        "schedule": datasets.current_season,
+        "season_results": datasets.season_results,
+        "sprint_results": datasets.sprint_results,
+        "driver_standings": datasets.driver_standings,
+        "constructor_standings": datasets.constructor_standings,
+    }
+    # Applying a whole live timing session, message by message.
+    recording = json.dumps(synthesize_live())
+    samples = []
+    for _ in range(max(repeat // 20, 3)):
+        events = json.loads(recording)
+        session = LiveSession()
+        started = time.perf_counter()
+        for _, topic, data in events:
+            session.apply(topic, data)
+        samples.append((time.perf_counter() - started) / len(events))
+    results["micro.live.apply_us"] = statistics.median(samples) * 1e6
+    results["micro.live.positions_us"] = _median_us(session.positions, repeat)
+
+    # Season analytics: built from every round, and the latest round added
+    # to the ones before it.
+    schedule = ScheduleIndex.from_data(fixtures["schedule"])
+    tables = {
+        kind: RaceTable.from_payload(fixtures[name])
+        for kind, name in (("race", "season_results"), ("sprint", "sprint_results"), ("qualifying", "qualifying"))
+    }
+    last = max((int(race.round) for table in tables.values() for race in table.races), default=0)
+    before = {
+        kind: RaceTable(table.season, tuple(race for race in table.races if int(race.round) < last))
+        for kind, table in tables.items()
+    }
+
+    def _build(tables):
+        analytics = SeasonAnalytics()
+        analytics.set_schedule(schedule)
+        for kind, table in tables.items():
+            analytics.update(kind, table)
+        return analytics
+
+    def _add_round():
+        analytics = _build(before)
+        started = time.perf_counter()
+        for kind, table in tables.items():
+            analytics.update(kind, table)
+        return time.perf_counter() - started
+
+    results["micro.analytics.build_us"] = _median_us(lambda: _build(tables), repeat)
+    results["micro.analytics.round_us"] = statistics.median(_add_round() for _ in range(repeat)) * 1e6
+    analytics = _build(tables)
+    results["micro.analytics.project_us"] = _median_us(
+        lambda: (analytics.progression(), analytics.gaps(), analytics.head_to_head()), repeat
+    )
+
+    for name, payload in fixtures.items():
+        body = json.dumps(payload).encode()
+        parse = parsers.get(name, RaceTable.from_payload)
+        results[f"micro.{name}.bytes"] = len(body)
+        results[f"micro.{name}.decode_stdlib_us"] = _median_us(lambda: json.loads(body), repeat)
+        results[f"micro.{name}.decode_us"] = _median_us(lambda: json_loads(body), repeat)
+        results[f"micro.{name}.parse_us"] = _median_us(lambda: parse(payload), repeat)
+        if name in projections:
+            parsed = parse(payload)
+            results[f"micro.{name}.project_us"] = _median_us(lambda: projections[name](parsed), repeat)
+
+
+def check_sections(fixtures):
+    """Return the section checks that fail: a changed output must change the update token.
+
+    Entities skip their write while the section key and fingerprint stay the
+    same, so a section that misses an input leaves the state behind.
+    """
+    from custom_components.f1_sensor.model import RaceTable
+    from custom_components.f1_sensor.schedule import ScheduleIndex
+    from custom_components.f1_sensor.sensor import F1CurrentSeasonSensor
+
+    def _token(table):
+        coordinator = SimpleNamespace(model=table, schedule=ScheduleIndex.from_table(table))
+        entity = F1CurrentSeasonSensor(coordinator, "F1")
+        entity.compact = True
+        return entity._section_key(), json.dumps(entity._section(table), sort_keys=True)
+
+    table = RaceTable.from_payload(fixtures["schedule"])
+    # Cancel the final round, which is neither the last nor the next race
+    # while the season is under way.
+    cancelled = RaceTable(table.season, table.races[:-1])
+    failures = []
+    if _token(table) == _token(cancelled):
+        failures.append("current_season (compact) misses a changed race count")
+    return failures
+
+
+# The season payloads a full setup keeps, compared as dicts and as the model.
+SEASON_PAYLOADS = (
+    "schedule", "season_results", "sprint_results", "qualifying", "driver_standings", "constructor_standings",
+)
+
+
+def _retained_kib(load):
+    """Traced memory still held by what ``load()`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = load()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return retained / 1024
+
+
+def bench_memory(fixtures, results):
+    """Memory of the season payloads as decoded dicts and as the slotted, interned model."""
+    from homeassistant.util.json import json_loads
+
+    from custom_components.f1_sensor.model import RaceTable, StandingsTable
+
+    bodies = {name: json.dumps(fixtures[name]).encode() for name in SEASON_PAYLOADS}
+
+    def _parse(name, body):
+        parse = StandingsTable.from_payload if name.endswith("_standings") else RaceTable.from_payload
+        return parse(json_loads(body))
+
+    results["memory.season_raw_kib"] = _retained_kib(
+        lambda: [json_loads(body) for body in bodies.values()]
+    )
+    results["memory.season_model_kib"] = _retained_kib(
+        lambda: [_parse(name, body) for name, body in bodies.items()]
+    )
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def mock_server(args):
+    """Run the mock server in its own process, so it does not count towards our CPU time."""
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "benchmarks.mock_server", "--port", str(port),
+        "--latency", str(args.latency), "--jitter", str(args.jitter), "--error-rate", str(args.error_rate),
+        "--throttle-rate", str(args.throttle_rate),
+    ]
+    if args.no_etags:
+        cmd.append("--no-etags")
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        line = proc.stdout.readline()
+        if not line.startswith("Serving on"):
+            raise RuntimeError(f"Mock server failed to start: {line!r}")
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+async def _server_stats(session, base_url):
+    async with session.get(f"{base_url}/_stats") as resp:
+        return await resp.json()
+
+
+async def bench_integration(base_url, args, results):
+    from homeassistant import config_entries, loader
+    from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+    from homeassistant.helpers.entity_platform import async_get_platforms
+    from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+    from custom_components.f1_sensor import api
+    from custom_components.f1_sensor.const import DOMAIN
+    from custom_components.f1_sensor.coordinator import DATA_COORDINATORS, F1DataCoordinator
+
+    monitor = LoopMonitor()
+    with tempfile.TemporaryDirectory() as config_dir, monitor.installed():
+        os.makedirs(f"{config_dir}/custom_components")
+        os.symlink(ROOT / "custom_components" / "f1_sensor", f"{config_dir}/custom_components/f1_sensor")
+        sys.path.insert(0, config_dir)
+
+        async with aiohttp.ClientSession() as session, async_test_home_assistant(config_dir=config_dir) as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            redirect = RedirectSession(session, base_url)
+
+            async def _setup(phase, entry_id=None):
+                before = await _server_stats(session, base_url)
+                monitor.reset()
+                started = time.perf_counter()
+                if entry_id is None:
+                    result = await hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_USER},
+                        data={"sensor_name": "F1", "enabled_sensors": ALL_SENSORS},
+                    )
+                    entry_id = result["result"].entry_id
+                else:
+                    await hass.config_entries.async_setup(entry_id)
+                await hass.async_block_till_done()
+                results[f"setup.{phase}.wall_ms"] = (time.perf_counter() - started) * 1000
+                monitor.report(f"setup.{phase}", results)
+                after = await _server_stats(session, base_url)
+                results[f"setup.{phase}.requests"] = after["requests"] - before["requests"]
+                results[f"setup.{phase}.kib"] = (after["bytes"] - before["bytes"]) / 1024
+                return entry_id
+
+            async def _unload(entry_id):
+                await hass.config_entries.async_unload(entry_id)
+                # Write the delayed cache saves, as Home Assistant does on stop.
+                hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+                await hass.async_block_till_done()
+
+            # The mock answers for the real hosts; their request budgets would
+            # make every setup wait on the clock unless asked for.
+            limits = api.RATE_LIMITS if args.rate_limits else {}
+            with patch.object(api, "async_get_clientsession", lambda hass: redirect), \
+                    patch.object(api, "RATE_LIMITS", limits):
+                entry_id = await _setup("cold")
+                await _unload(entry_id)
+                await _setup("warm", entry_id)
+                await _unload(entry_id)
+
+                gc.collect()
+                tracemalloc.start()
+                await _setup("traced", entry_id)
+                gc.collect()
+                retained, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results["memory.setup_peak_kib"] = peak / 1024
+                results["memory.retained_kib"] = retained / 1024
+                for key in [k for k in results if k.startswith("setup.traced.")]:
+                    del results[key]
+
+                for platform in async_get_platforms(hass, DOMAIN):
+                    for entity in platform.entities.values():
+                        key = entity.unique_id.removeprefix("F1_").removesuffix("_unique")
+
+                        def _read(entity=entity):
+                            return entity.state, entity.extra_state_attributes
+
+                        def _read_cold(entity=entity):
+                            entity._projection = None
+                            return _read()
+
+                        results[f"sensor.{key}.cold_us"] = _median_us(_read_cold, args.repeat)
+                        results[f"sensor.{key}.warm_us"] = _median_us(_read, args.repeat)
+
+                for coordinator in list(hass.data.get(DATA_COORDINATORS, {}).values()):
+                    # The analytics follow the others without requests of their own.
+                    if not isinstance(coordinator, F1DataCoordinator):
+                        continue
+                    key = coordinator.name.removeprefix("F1 ").removesuffix(" Coordinator").lower().replace(" ", "_")
+                    for phase in ("revalidate", "full"):
+                        if phase == "full":
+                            coordinator._validated.clear()
+                        monitor.reset()
+                        started = time.process_time()
+                        await coordinator.async_refresh()
+                        results[f"refresh.{key}.{phase}_cpu_ms"] = (time.process_time() - started) * 1000
+                        monitor.report(f"refresh.{key}.{phase}", results)
+
+                await _unload(entry_id)
+
+
+def compare(results, baseline, tolerance):
+    """Return ``[(metric, baseline, value)]`` for metrics that got worse than the tolerance allows."""
+    regressions = []
+    for metric, value in sorted(results.items()):
+        base = baseline.get(metric)
+        if base is None or metric.endswith(".bytes"):
+            continue
+        # Ignore noise on metrics that are close to zero.
+        if value > base * (1 + tolerance) and value - base > 1:
+            regressions.append((metric, base, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="samples per micro benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="mock server latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of mock requests failing with 503")
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="share of mock requests failing with 429"
+    )
+    parser.add_argument("--no-etags", action="store_true", help="mock server never answers 304")
+    parser.add_argument("--rate-limits", action="store_true", help="keep the per-host request budgets")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--micro-only", action="store_true", help="skip the Home Assistant benchmarks")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    results = {}
+    fixtures = load_fixtures()
+    failures = check_sections(fixtures)
+    # Before the micro benchmarks, whose models would hold interned instances.
+    bench_memory(fixtures, results)
+    bench_micro(fixtures, args.repeat, results)
+    if not args.micro_only:
+        with mock_server(args) as base_url:
+            asyncio.run(bench_integration(base_url, args, results))
+
+    RESULTS.write_text(json.dumps(results, indent=2, sort_keys=True))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    for metric, value in sorted(results.items()):
+        base = baseline.get(metric)
+        delta = f"{(value - base) / base:+8.1%}" if base else ""
+        print(f"{metric:60} {value:12.1f} {delta}")
+    for failure in failures:
+        print(f"SECTION {failure}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True))
+        print(f"Baseline written to {args.baseline}")
+        return 1 if failures else 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for metric, base, value in regressions:
+        print(f"REGRESSION {metric}: {base:.1f} -> {value:.1f}")
+    return 1 if regressions or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
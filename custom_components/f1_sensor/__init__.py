@@ -1,14 +1,13 @@
-
+import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
-import aiohttp
-import async_timeout
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .api import async_get_client
 from .const import (
     DOMAIN,
     PLATFORMS,
@@ -17,133 +16,198 @@ from .const import (
     CONSTRUCTOR_STANDINGS_URL,
     LAST_RACE_RESULTS_URL,
     SEASON_RESULTS_URL,
+    SPRINT_RESULTS_URL,
+    SEASON_QUALIFYING_URL,
+    ROUND_RESULTS_URL,
+    ROUND_SPRINT_RESULTS_URL,
+    QUALIFYING_RESULTS_URL,
+    LIVE_TIMING_URL,
+    ANALYTICS_KEY,
+    PRIORITY_RESULTS,
+    PRIORITY_STANDINGS,
+    ENDPOINTS,
+    SENSOR_ENDPOINTS,
+    SIGNAL_SENSORS_CHANGED,
+)
+from .coordinator import (
+    F1DataCoordinator,
+    F1RoundResultsCoordinator,
+    F1QualifyingCoordinator,
+    F1RaceCoordinator,
+    async_acquire_coordinator,
+    async_release_coordinator,
 )
+from .analytics import F1AnalyticsCoordinator
+from .live import F1LiveTimingCoordinator
+from .model import RaceTable, StandingsTable
+from .polling import AdaptivePolling
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
-BASE_URL = "https://api.jolpi.ca/ergast/f1/current/{round}/qualifying.json"
-
-async def find_latest_valid_qualifying_round_upwards(start_round: int, max_round: int = 24):
-    latest_valid_round = None
-    async with aiohttp.ClientSession() as session:
-        for round_num in range(start_round, max_round + 1):
-            url = BASE_URL.format(round=round_num)
-            try:
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        break
-                    data = await resp.json()
-                    races = data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-                    if races:
-                        _LOGGER.debug("Geldige qualifying data gevonden voor round %s", round_num)
-                        latest_valid_round = round_num
-                    else:
-                        break
-            except Exception as e:
-                _LOGGER.warning("Fout bij ophalen qualifying data voor round %s: %s", round_num, e)
-                break
-    return latest_valid_round
-
-class F1DataCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, url, name):
-        self.url = url
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=name,
-            update_interval=timedelta(hours=1),
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Plain endpoints: url, coordinator name, the sessions that move their data,
+# the model the payload parses into and the request priority. Standings move
+# after sprints and races, results only after races.
+_ENDPOINTS = {
+    "driver": (
+        DRIVER_STANDINGS_URL, "F1 Driver Standings Coordinator", ("sprint", "race"), StandingsTable,
+        PRIORITY_STANDINGS,
+    ),
+    "constructor": (
+        CONSTRUCTOR_STANDINGS_URL, "F1 Constructor Standings Coordinator", ("sprint", "race"), StandingsTable,
+        PRIORITY_STANDINGS,
+    ),
+    "last_race": (
+        LAST_RACE_RESULTS_URL, "F1 Last Race Results Coordinator", ("race",), RaceTable, PRIORITY_RESULTS
+    ),
+}
+
+# Season-long results kept per round: season url, per-round url, coordinator
+# name and the session that produces the results.
+_ROUND_ENDPOINTS = {
+    "season_results": (SEASON_RESULTS_URL, ROUND_RESULTS_URL, "F1 Season Results Coordinator", "race"),
+    "sprint_results": (SPRINT_RESULTS_URL, ROUND_SPRINT_RESULTS_URL, "F1 Sprint Results Coordinator", "sprint"),
+    "season_qualifying": (
+        SEASON_QUALIFYING_URL, QUALIFYING_RESULTS_URL, "F1 Season Qualifying Coordinator", "qualifying"
+    ),
+}
+
+# Analytics source per session kind.
+_ANALYTICS_SOURCES = {"race": "season_results", "sprint": "sprint_results", "qualifying": "season_qualifying"}
+
+def _required_endpoints(enabled):
+    required = {endpoint for key in enabled for endpoint in SENSOR_ENDPOINTS.get(key, ())}
+    return [endpoint for endpoint in ENDPOINTS if endpoint in required]
+
+def _create_coordinator(hass: HomeAssistant, endpoint, acquired):
+    """Create the coordinator of ``endpoint``; ``acquired`` holds those it builds on."""
+    client = async_get_client(hass)
+    race_coordinator = acquired.get("race")
+    if endpoint == "race":
+        return F1RaceCoordinator(hass, client, API_URL, "F1 Race Data Coordinator")
+    if endpoint == "last_qualifying":
+        return F1QualifyingCoordinator(
+            hass, client, race_coordinator, "F1 Last Qualifying Results Coordinator"
         )
+    if endpoint == "live":
+        return F1LiveTimingCoordinator(hass, client, race_coordinator)
+    if endpoint == "analytics":
+        sources = {kind: acquired[source] for kind, source in _ANALYTICS_SOURCES.items()}
+        return F1AnalyticsCoordinator(hass, client, race_coordinator, sources)
+    if endpoint in _ROUND_ENDPOINTS:
+        url, round_url, name, kind = _ROUND_ENDPOINTS[endpoint]
+        return F1RoundResultsCoordinator(hass, client, race_coordinator, url, round_url, name, kind)
+    url, name, kinds, model, priority = _ENDPOINTS[endpoint]
+    return F1DataCoordinator(
+        hass, client, url, name, AdaptivePolling(race_coordinator, kinds), model=model, priority=priority
+    )
 
-    async def _async_update_data(self):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.url) as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"API error {resp.status}")
-                return await resp.json()
+def _endpoint_key(endpoint):
+    if endpoint == "race":
+        return API_URL
+    if endpoint == "last_qualifying":
+        return QUALIFYING_RESULTS_URL
+    if endpoint == "live":
+        return LIVE_TIMING_URL
+    if endpoint == "analytics":
+        return ANALYTICS_KEY
+    if endpoint in _ROUND_ENDPOINTS:
+        return _ROUND_ENDPOINTS[endpoint][0]
+    return _ENDPOINTS[endpoint][0]
+
+async def _async_start_chain(coordinators, required=False):
+    """Start coordinators one after another; the first may be required."""
+    for i, coordinator in enumerate(coordinators):
+        await coordinator.async_start(required and i == 0)
+
+async def _async_sync_coordinators(hass: HomeAssistant, entry: ConfigEntry, coordinators, setup=False):
+    """Acquire and start the coordinators the enabled sensors need.
+
+    Coordinators come from a registry shared by all config entries, so an
+    endpoint another entry already polls is reused rather than fetched again.
+    Returns the coordinators this entry no longer needs, for the caller to
+    release once their entities are gone.
+    """
+    required = _required_endpoints(entry.data.get("enabled_sensors", []))
+    unused = [coordinators.pop(endpoint) for endpoint in list(coordinators) if endpoint not in required]
+
+    new = {}
+    for endpoint in required:
+        if endpoint not in coordinators:
+            acquired = {**coordinators, **new}
+            new[endpoint] = async_acquire_coordinator(
+                hass,
+                _endpoint_key(endpoint),
+                lambda endpoint=endpoint, acquired=acquired: _create_coordinator(hass, endpoint, acquired),
+            )
+    if not new:
+        return unused
+
+    # The schedule goes first and is required at setup; the qualifying probe
+    # chains off it, everything else starts concurrently. A failing endpoint
+    # only leaves its own entities unavailable until the next update, and
+    # coordinators with a cached snapshot do not wait for the network at all.
+    chain = [new[endpoint] for endpoint in ("race", "last_qualifying") if endpoint in new]
+    others = [coordinator for endpoint, coordinator in new.items() if endpoint not in ("race", "last_qualifying")]
+    results = await asyncio.gather(
+        _async_start_chain(chain, required=setup and "race" in new),
+        *(coordinator.async_start() for coordinator in others),
+        return_exceptions=True,
+    )
+    if isinstance(results[0], BaseException):
+        for coordinator in new.values():
+            async_release_coordinator(hass, coordinator)
+        raise results[0]
+    for coordinator, result in zip(others, results[1:]):
+        if isinstance(result, BaseException):
+            _LOGGER.warning("Starting %s failed: %s", coordinator.name, result)
+
+    coordinators.update(new)
+    return unused
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration services."""
+    async_setup_services(hass)
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up integration via config flow."""
-    race_coordinator = F1DataCoordinator(hass, API_URL, "F1 Race Data Coordinator")
-    driver_coordinator = F1DataCoordinator(hass, DRIVER_STANDINGS_URL, "F1 Driver Standings Coordinator")
-    constructor_coordinator = F1DataCoordinator(hass, CONSTRUCTOR_STANDINGS_URL, "F1 Constructor Standings Coordinator")
-    last_race_coordinator = F1DataCoordinator(hass, LAST_RACE_RESULTS_URL, "F1 Last Race Results Coordinator")
-    season_results_coordinator = F1DataCoordinator(hass, SEASON_RESULTS_URL, "F1 Season Results Coordinator")
-
-    await race_coordinator.async_config_entry_first_refresh()
-    await driver_coordinator.async_config_entry_first_refresh()
-    await constructor_coordinator.async_config_entry_first_refresh()
-    await last_race_coordinator.async_config_entry_first_refresh()
-    await season_results_coordinator.async_config_entry_first_refresh()
-
-    # Dynamisch bepalen van de juiste qualifying ronde
-    races = race_coordinator.data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-    now = datetime.now(timezone.utc)
-
-    next_race = None
-    for race in races:
-        date = race.get("date")
-        time = race.get("time", "00:00:00Z")
-        dt_str = f"{date}T{time}".replace("Z", "+00:00")
-        try:
-            race_dt = datetime.fromisoformat(dt_str)
-        except ValueError:
-            continue
-        if race_dt > now:
-            next_race = race
-            break
-
-    start_round = int(next_race.get("round", "2")) - 1 if next_race else 1
-    target_round = await find_latest_valid_qualifying_round_upwards(start_round)
-    if not target_round:
-        target_round = 1
-
-    qualifying_url = BASE_URL.format(round=target_round)
-    _LOGGER.debug("F1 Qualifying URL: %s", qualifying_url)
-
-    last_qualifying_coordinator = F1DataCoordinator(
-        hass, qualifying_url, "F1 Last Qualifying Results Coordinator"
-    )
-    await last_qualifying_coordinator.async_config_entry_first_refresh()
+    coordinators = {}
+    await _async_sync_coordinators(hass, entry, coordinators, setup=True)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
-        "race_coordinator": race_coordinator,
-        "driver_coordinator": driver_coordinator,
-        "constructor_coordinator": constructor_coordinator,
-        "last_race_coordinator": last_race_coordinator,
-        "last_qualifying_coordinator": last_qualifying_coordinator,
-        "season_results_coordinator": season_results_coordinator,
+        "sensor_name": entry.data.get("sensor_name"),
+        "compact_attributes": entry.data.get("compact_attributes", False),
+        "coordinators": coordinators,
     }
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply a reconfiguration by starting and stopping only what changed."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    if (
+        entry.data.get("sensor_name") != data["sensor_name"]
+        or entry.data.get("compact_attributes", False) != data["compact_attributes"]
+    ):
+        # Every entity name and unique id derives from the sensor name, and
+        # the attribute mode is fixed when the entities are created.
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    unused = await _async_sync_coordinators(hass, entry, data["coordinators"])
+    async_dispatcher_send(hass, SIGNAL_SENSORS_CHANGED.format(entry.entry_id))
+    for coordinator in unused:
+        async_release_coordinator(hass, coordinator)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        for coordinator in data["coordinators"].values():
+            async_release_coordinator(hass, coordinator)
     return unload_ok
-
-class F1DataCoordinator(DataUpdateCoordinator):
-    """Handles updates from a given F1 endpoint."""
-
-    def __init__(self, hass: HomeAssistant, url: str, name: str):
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=name,
-            update_interval=timedelta(hours=1),
-        )
-        self._session = aiohttp.ClientSession()
-        self._url = url
-
-    async def _async_update_data(self):
-        """Fetch data from the F1 API."""
-        try:
-            async with async_timeout.timeout(10):
-                async with self._session.get(self._url) as response:
-                    if response.status != 200:
-                        raise UpdateFailed(f"Error fetching data: {response.status}")
-                    return await response.json()
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching data: {err}") from err
-
@@ -0,0 +1,383 @@
+"""Championship analytics derived from the per-round results, kept up to date round by round."""
+from array import array
+from bisect import bisect_left
+import itertools
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .api import F1ApiClient
+from .const import ANALYTICS_KEY
+from .coordinator import F1BaseCoordinator
+from .model import RACE
+
+_LOGGER = logging.getLogger(__name__)
+
+SPRINT = "sprint"
+QUALIFYING = "qualifying"
+# Sessions that score points.
+SCORING = (RACE, SPRINT)
+
+
+def max_points(kind, season):
+    """Most points one driver can score in a ``kind`` session of ``season``."""
+    season = int(season or 0)
+    if kind == SPRINT:
+        return 3 if season == 2021 else 8
+    # A point for the fastest lap from 2019 until 2024.
+    return 26 if 2019 <= season <= 2024 else 25
+
+
+def _points(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _position(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _number(value):
+    """Points as shown: 25 rather than 25.0, but 0.5 as is."""
+    return int(value) if value == int(value) else value
+
+
+def _duels(results):
+    """Teammates of one session, as ``{(constructor, a, b): (a ahead, b ahead)}``."""
+    teams = {}
+    for result in results:
+        position = _position(result.position)
+        if position is not None:
+            teams.setdefault(result.constructor.constructor_id, []).append((result.driver.driver_id, position))
+    duels = {}
+    for constructor_id, drivers in teams.items():
+        drivers.sort()
+        for (a, position_a), (b, position_b) in itertools.combinations(drivers, 2):
+            duels[(constructor_id, a, b)] = (int(position_a < position_b), int(position_b < position_a))
+    return duels
+
+
+class SeasonAnalytics:
+    """Points progression, gaps and teammate duels of one season.
+
+    Cumulative points are compact arrays per driver and constructor, indexed
+    like ``rounds``. Races are applied per session kind and round; a round
+    whose parsed race is the one already applied is skipped, a new round
+    adds one column, and a corrected round only recomputes the cumulative
+    points from that round on. Teammate duels are running totals that each
+    round's contribution is added to or taken out of.
+
+    ``versions`` counts the changes of the points, the duels and the
+    remaining sessions, so entities can tell whether what they read changed.
+    """
+
+    def __init__(self, season=None):
+        self.versions = {"points": 0, "duels": 0, "remaining": 0}
+        self._schedule = None
+        self._reset(season)
+
+    def _reset(self, season):
+        self.season = season
+        self.rounds = []
+        self.drivers = {}
+        self.constructors = {}
+        # driver id -> constructor id of the latest round they scored in
+        self.teams = {}
+        self.driver_points = {}
+        self.constructor_points = {}
+        self.leader_points = array("d")
+        # (constructor id, driver a, driver b) -> [race a, race b, qualifying a, qualifying b]
+        self.duels = {}
+        self.remaining = {RACE: 0, SPRINT: 0}
+        # (kind, round) -> the parsed race applied
+        self._applied = {}
+        # (kind, round) -> {driver id: (points, constructor id)}
+        self._scores = {}
+        # (kind, round) -> that session's duels
+        self._round_duels = {}
+        self._team_rounds = {}
+
+    def update(self, kind, table):
+        """Apply the races of ``table`` as ``kind`` results; return True if anything changed."""
+        if table.season != self.season:
+            return False
+        seen = set()
+        changed_from = None
+        duels_changed = False
+        for race in table.races:
+            round_ = int(race.round)
+            seen.add(round_)
+            if self._applied.get((kind, round_)) is race:
+                continue
+            self._applied[(kind, round_)] = race
+            column, duels = self._apply(kind, round_, race)
+            duels_changed |= duels
+            if column is not None and (changed_from is None or column < changed_from):
+                changed_from = column
+        # Rounds the source no longer has, such as results withdrawn.
+        for key in [key for key in self._applied if key[0] == kind and key[1] not in seen]:
+            del self._applied[key]
+            column, duels = self._apply(kind, key[1], None)
+            duels_changed |= duels
+            if column is not None and (changed_from is None or column < changed_from):
+                changed_from = column
+
+        if changed_from is not None:
+            self._accumulate(changed_from)
+            self.versions["points"] += 1
+        if kind in SCORING:
+            # Sessions whose results just arrived are no longer open.
+            self._count_remaining()
+        if duels_changed:
+            self.versions["duels"] += 1
+        return changed_from is not None or duels_changed
+
+    def _apply(self, kind, round_, race):
+        """Replace one session's contribution; return (changed column, duels changed)."""
+        key = (kind, round_)
+        if race is None:
+            results = ()
+        elif kind == QUALIFYING:
+            results = race.qualifying_results
+        elif kind == SPRINT:
+            results = race.sprint_results
+        else:
+            results = race.results
+        for result in results:
+            self.drivers[result.driver.driver_id] = result.driver
+            self.constructors[result.constructor.constructor_id] = result.constructor
+
+        duels_changed = False
+        if kind != SPRINT:
+            duels = _duels(results)
+            old = self._round_duels.get(key, {})
+            if duels != old:
+                self._add_duels(kind, old, -1)
+                self._add_duels(kind, duels, 1)
+                self._round_duels[key] = duels
+                duels_changed = True
+        if kind == QUALIFYING:
+            return None, duels_changed
+
+        scores = {
+            result.driver.driver_id: (_points(result.points), result.constructor.constructor_id)
+            for result in results
+        }
+        if scores == self._scores.get(key, {}):
+            return None, duels_changed
+        self._scores[key] = scores
+        for driver_id, (_, constructor_id) in scores.items():
+            if round_ >= self._team_rounds.get(driver_id, 0):
+                self._team_rounds[driver_id] = round_
+                self.teams[driver_id] = constructor_id
+        return self._column(round_), duels_changed
+
+    def _add_duels(self, kind, duels, sign):
+        offset = 2 if kind == QUALIFYING else 0
+        for key, (a, b) in duels.items():
+            totals = self.duels.setdefault(key, [0, 0, 0, 0])
+            totals[offset] += sign * a
+            totals[offset + 1] += sign * b
+            # Every session has a winner, so all zero means no sessions left.
+            if not any(totals):
+                del self.duels[key]
+
+    def _column(self, round_):
+        """Index of ``round_`` in the arrays, inserting an empty column if it is new."""
+        i = bisect_left(self.rounds, round_)
+        if i == len(self.rounds) or self.rounds[i] != round_:
+            self.rounds.insert(i, round_)
+            self.leader_points.insert(i, 0)
+            for series in itertools.chain(self.driver_points.values(), self.constructor_points.values()):
+                series.insert(i, series[i - 1] if i else 0)
+        return i
+
+    def _accumulate(self, start):
+        """Recompute the cumulative points of every round from column ``start`` on."""
+        rounds = self.rounds
+        for i in range(start, len(rounds)):
+            drivers = {}
+            constructors = {}
+            for kind in SCORING:
+                for driver_id, (points, constructor_id) in self._scores.get((kind, rounds[i]), {}).items():
+                    drivers[driver_id] = drivers.get(driver_id, 0) + points
+                    constructors[constructor_id] = constructors.get(constructor_id, 0) + points
+            for table, scored in ((self.driver_points, drivers), (self.constructor_points, constructors)):
+                for key in scored:
+                    if key not in table:
+                        table[key] = array("d", bytes(8 * len(rounds)))
+                for key, series in table.items():
+                    series[i] = (series[i - 1] if i else 0) + scored.get(key, 0)
+            self.leader_points[i] = max((series[i] for series in self.driver_points.values()), default=0)
+
+    def set_schedule(self, schedule):
+        """Follow the season of ``schedule`` and count its sessions without results yet."""
+        if schedule.season != self.season:
+            self._reset(schedule.season)
+            self.versions["points"] += 1
+            self.versions["duels"] += 1
+        self._schedule = schedule
+        self._count_remaining()
+
+    def _count_remaining(self):
+        if self._schedule is None:
+            return
+        remaining = {RACE: 0, SPRINT: 0}
+        for race in self._schedule.races:
+            for session in race.sessions:
+                if session.kind in remaining and (session.kind, int(race.round)) not in self._applied:
+                    remaining[session.kind] += 1
+        if remaining != self.remaining:
+            self.remaining = remaining
+            self.versions["remaining"] += 1
+
+    def driver_label(self, driver_id):
+        driver = self.drivers.get(driver_id)
+        return (driver.code or driver.family_name or driver_id) if driver else driver_id
+
+    def constructor_label(self, constructor_id):
+        constructor = self.constructors.get(constructor_id)
+        return constructor.name if constructor else constructor_id
+
+    def driver_points_now(self, driver_id):
+        series = self.driver_points.get(driver_id)
+        return series[-1] if series else 0
+
+    def driver_order(self):
+        """Driver ids by current points, most first."""
+        return sorted(
+            self.driver_points, key=lambda driver_id: (-self.driver_points[driver_id][-1], self.driver_label(driver_id))
+        )
+
+    def progression(self):
+        return {
+            "rounds": list(self.rounds),
+            "drivers": {
+                self.driver_label(driver_id): [_number(v) for v in self.driver_points[driver_id]]
+                for driver_id in self.driver_order()
+            },
+            "constructors": {
+                self.constructor_label(constructor_id): [_number(v) for v in series]
+                for constructor_id, series in sorted(self.constructor_points.items(), key=lambda item: -item[1][-1])
+            },
+        }
+
+    def gaps(self):
+        """Per driver, by current points: gap to the leader and to the driver ahead, and the gap per round."""
+        standings = []
+        progression = {}
+        ahead = None
+        for position, driver_id in enumerate(self.driver_order(), 1):
+            series = self.driver_points[driver_id]
+            points = series[-1]
+            label = self.driver_label(driver_id)
+            standings.append({
+                "position": position,
+                "driver": label,
+                "constructor": self.constructor_label(self.teams.get(driver_id)),
+                "points": _number(points),
+                "gap_to_leader": _number(self.leader_points[-1] - points),
+                "gap_to_next": _number(ahead - points) if ahead is not None else None,
+            })
+            progression[label] = [_number(leader - value) for leader, value in zip(self.leader_points, series)]
+            ahead = points
+        return standings, progression
+
+    def head_to_head(self):
+        """Teammate duels, by constructor and then by points of the pair."""
+        rows = []
+        for (constructor_id, a, b), (race_a, race_b, qualifying_a, qualifying_b) in self.duels.items():
+            pair = [(a, race_a, qualifying_a), (b, race_b, qualifying_b)]
+            pair.sort(key=lambda entry: -self.driver_points_now(entry[0]))
+            rows.append({
+                "constructor": self.constructor_label(constructor_id),
+                "drivers": [self.driver_label(driver_id) for driver_id, _, _ in pair],
+                "race": [race for _, race, _ in pair],
+                "qualifying": [qualifying for _, _, qualifying in pair],
+                "points": [_number(self.driver_points_now(driver_id)) for driver_id, _, _ in pair],
+            })
+        rows.sort(key=lambda row: (row["constructor"] or "", -sum(row["points"])))
+        return rows
+
+    @property
+    def max_points_available(self):
+        return sum(count * max_points(kind, self.season) for kind, count in self.remaining.items())
+
+    def title_contenders(self):
+        """Drivers who can still reach the leader's points, with the most they can end on."""
+        available = self.max_points_available
+        leader = self.leader_points[-1] if self.leader_points else 0
+        contenders = []
+        for driver_id in self.driver_order():
+            points = self.driver_points[driver_id][-1]
+            if points + available < leader:
+                break
+            contenders.append({
+                "driver": self.driver_label(driver_id),
+                "points": _number(points),
+                "behind": _number(leader - points),
+                "max_points": _number(points + available),
+            })
+        return contenders
+
+
+class F1AnalyticsCoordinator(F1BaseCoordinator):
+    """Keeps :class:`SeasonAnalytics` in step with the season results coordinators.
+
+    It makes no requests of its own. ``sources`` maps a session kind to the
+    round-keyed results coordinator of that kind; whenever one of them or
+    the schedule updates, only the rounds whose parsed race changed are
+    reapplied, and listeners are notified only if that changed anything.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: F1ApiClient, race_coordinator, sources):
+        super().__init__(hass, _LOGGER, client, ANALYTICS_KEY, "F1 Season Analytics")
+        self._race_coordinator = race_coordinator
+        self._sources = sources
+        self.analytics = SeasonAnalytics()
+        self.data = self.analytics
+        self._unsubs = []
+
+    async def async_start(self, required=False):
+        """Follow the sources; they start on their own."""
+        if not self._unsubs:
+            for coordinator in (self._race_coordinator, *self._sources.values()):
+                self._unsubs.append(coordinator.async_add_listener(self._async_sources_updated))
+            self._async_sources_updated()
+
+    async def async_shutdown(self):
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        await super().async_shutdown()
+
+    async def _async_update_data(self):
+        # Derived from the sources, which refresh on their own.
+        return self.analytics
+
+    @callback
+    def _async_sources_updated(self):
+        analytics = self.analytics
+        started = time.perf_counter()
+        versions = dict(analytics.versions)
+        analytics.set_schedule(self._race_coordinator.schedule)
+        for kind, coordinator in self._sources.items():
+            analytics.update(kind, coordinator.model)
+        stale = any(coordinator.stale for coordinator in self._sources.values())
+        if analytics.versions == versions and stale == self.stale:
+            return
+        elapsed = time.perf_counter() - started
+        self.stats.last_decode_time = elapsed
+        self.stats.decode_time_total += elapsed
+        _LOGGER.debug("%s updated to round %s in %.1f ms", self.name, analytics.rounds[-1:], elapsed * 1000)
+        self.stale = stale
+        self.last_fetched = self.last_changed = dt_util.utcnow()
+        self.data_version += 1
+        self.async_set_updated_data(analytics)
@@ -0,0 +1,239 @@
+"""Shared HTTP transport for the Jolpica-F1 and met.no endpoints."""
+import asyncio
+from email.utils import parsedate_to_datetime
+import hashlib
+import logging
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import (
+    DECODE_EXECUTOR_THRESHOLD,
+    DOMAIN,
+    PRIORITY_RESULTS,
+    RATE_LIMITS,
+    REQUEST_RETRIES,
+    REQUEST_RETRY_DELAY,
+    REQUEST_TIMEOUT,
+    RETRY_AFTER_MAX,
+)
+from .ratelimit import HostLimiter
+from .stats import EndpointStats
+
+DATA_CLIENT = f"{DOMAIN}_client"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class F1ApiError(Exception):
+    """Raised when a request still fails after all retries."""
+
+
+class F1ApiResponse:
+    """Outcome of a GET: the decoded body, or ``None`` on 304 Not Modified.
+
+    ``model`` is the body parsed by the caller's ``parse`` function, if any.
+    """
+
+    __slots__ = (
+        "status", "data", "etag", "last_modified", "expires", "size", "decode_time", "fingerprint", "model"
+    )
+
+    def __init__(
+        self,
+        status,
+        data=None,
+        etag=None,
+        last_modified=None,
+        expires=None,
+        size=0,
+        decode_time=0.0,
+        fingerprint=None,
+        model=None,
+    ):
+        self.status = status
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.size = size
+        self.decode_time = decode_time
+        self.fingerprint = fingerprint
+        self.model = model
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+def fingerprint(body):
+    """Return a short content hash of raw bytes."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _decode(body, parse):
+    """Decode, fingerprint and optionally parse a body; safe to run in the executor."""
+    started = time.perf_counter()
+    data = json_loads(body)
+    model = parse(data) if parse is not None else None
+    return data, model, time.perf_counter() - started, fingerprint(body)
+
+
+def _parse_http_date(value):
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delay or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    when = _parse_http_date(value)
+    if when is None:
+        return None
+    return max((when - dt_util.utcnow()).total_seconds(), 0)
+
+
+@callback
+def async_get_client(hass: HomeAssistant):
+    """Return the client shared by every config entry."""
+    client = hass.data.get(DATA_CLIENT)
+    if client is None:
+        client = hass.data[DATA_CLIENT] = F1ApiClient(hass)
+    return client
+
+
+class F1ApiClient:
+    """Single pooled client used by every coordinator and the weather forecast.
+
+    It sits on Home Assistant's shared session, so connections to each host
+    are kept alive and reused across requests and torn down with Home
+    Assistant itself. Requests to the hosts in RATE_LIMITS wait for that
+    host's budget, schedule first and standings last.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._session = async_get_clientsession(hass)
+        self._timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        # (url, headers) -> task of the request currently in flight
+        self._inflight = {}
+        self.limiters = {
+            host: HostLimiter(hass.loop, limits) for host, limits in RATE_LIMITS.items()
+        }
+
+    @property
+    def session(self):
+        """The shared aiohttp session, for the live timing websocket."""
+        return self._session
+
+    def limiter(self, url):
+        """The limiter for the host of ``url``, or None if it is not limited."""
+        return self.limiters.get(urlsplit(url).hostname)
+
+    async def async_get(self, url, headers=None, parse=None, stats=None, priority=PRIORITY_RESULTS):
+        """GET ``url`` and return an :class:`F1ApiResponse`.
+
+        Identical requests issued while one is already in flight wait for
+        that request instead of starting another; they share its ``parse``
+        and ``priority``, and only the first caller's ``stats`` record it.
+        """
+        key = (url, tuple(sorted((headers or {}).items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = self._hass.async_create_background_task(
+                self._async_get(url, headers, parse, stats, priority), f"{DOMAIN} GET {url}"
+            )
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _async_get(self, url, headers=None, parse=None, stats=None, priority=PRIORITY_RESULTS):
+        """Perform the GET behind :meth:`async_get`.
+
+        Every attempt first waits for the host's budget. Timeouts, connection
+        errors and 5xx responses are retried with jittered exponential
+        backoff. A 429, or a 5xx with Retry-After, holds every request to the
+        host for the time the server asked (or the backoff), unless that is
+        longer than RETRY_AFTER_MAX. A 304 is returned as-is and other
+        non-200 responses fail immediately. Bodies larger than
+        DECODE_EXECUTOR_THRESHOLD are decoded and parsed in the executor.
+        Attempts, retries, queueing, latency and failures are counted in
+        ``stats``.
+        """
+        stats = stats or EndpointStats()
+        limiter = self.limiter(url)
+        error = None
+        delay = 0
+        for attempt in range(REQUEST_RETRIES + 1):
+            if attempt:
+                stats.retries += 1
+                await asyncio.sleep(delay)
+            if limiter is not None:
+                stats.queue_time_total += await limiter.acquire(priority)
+            stats.requests += 1
+            # Jittered, so failures shared by several coordinators do not retry in lockstep.
+            delay = REQUEST_RETRY_DELAY * 2 ** attempt * random.uniform(0.5, 1.5)
+            started = time.monotonic()
+            try:
+                async with self._session.get(url, headers=headers, timeout=self._timeout) as resp:
+                    expires = _parse_http_date(resp.headers.get("Expires"))
+                    if resp.status == 304:
+                        stats.record_response(time.monotonic() - started, 0)
+                        return F1ApiResponse(304, expires=expires)
+                    if resp.status == 200:
+                        body = await resp.read()
+                        stats.record_response(time.monotonic() - started, len(body))
+                        etag = resp.headers.get("ETag")
+                        last_modified = resp.headers.get("Last-Modified")
+                        break
+                    error = F1ApiError(f"{url} returned HTTP {resp.status}")
+                    if resp.status != 429 and resp.status < 500:
+                        stats.record_error(error)
+                        raise error
+                    retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                    if resp.status == 429 or retry_after is not None:
+                        stats.rate_limited += int(resp.status == 429)
+                        wait = retry_after if retry_after is not None else delay
+                        if limiter is not None:
+                            # Holds this and every other request to the host.
+                            limiter.backoff(wait)
+                        if wait > RETRY_AFTER_MAX:
+                            error = F1ApiError(f"{url} returned HTTP {resp.status}, retry after {wait:.0f} s")
+                            stats.record_error(error)
+                            raise error
+                        delay = 0 if limiter is not None else wait
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                error = F1ApiError(f"{url}: {err!r}")
+            _LOGGER.debug("Attempt %s for %s failed: %s", attempt + 1, url, error)
+        else:
+            stats.record_error(error)
+            raise error
+
+        try:
+            if len(body) > DECODE_EXECUTOR_THRESHOLD:
+                decoded = await self._hass.async_add_executor_job(_decode, body, parse)
+            else:
+                decoded = _decode(body, parse)
+        except ValueError as err:
+            error = F1ApiError(f"{url} returned invalid JSON: {err}")
+            stats.record_error(error)
+            raise error from err
+        data, model, decode_time, digest = decoded
+        return F1ApiResponse(
+            200, data, etag, last_modified, expires, len(body), decode_time, digest, model
+        )
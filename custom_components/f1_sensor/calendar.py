@@ -0,0 +1,101 @@
+"""Calendar of every session of the season."""
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, SIGNAL_SENSORS_CHANGED
+from .scheduler import BOUNDARY_SESSION_END, BOUNDARY_SESSION_START
+
+CALENDAR_KEY = "calendar"
+
+SESSION_NAMES = {
+    "first_practice": "Practice 1",
+    "second_practice": "Practice 2",
+    "third_practice": "Practice 3",
+    "sprint_qualifying": "Sprint Qualifying",
+    "sprint": "Sprint",
+    "qualifying": "Qualifying",
+    "race": "Race",
+}
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Create the calendar when enabled and follow reconfiguration."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    base = entry.data.get("sensor_name", "F1")
+    entities = {}
+
+    @callback
+    def _async_sync_entities():
+        enabled = CALENDAR_KEY in entry.data.get("enabled_sensors", [])
+        if not enabled and CALENDAR_KEY in entities:
+            hass.async_create_task(entities.pop(CALENDAR_KEY).async_remove())
+        coordinator = data["coordinators"].get("race")
+        if enabled and coordinator and CALENDAR_KEY not in entities:
+            entities[CALENDAR_KEY] = F1CalendarEntity(coordinator, f"{base}_{CALENDAR_KEY}")
+            async_add_entities([entities[CALENDAR_KEY]])
+
+    _async_sync_entities()
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_SENSORS_CHANGED.format(entry.entry_id), _async_sync_entities)
+    )
+
+
+class F1CalendarEntity(CoordinatorEntity, CalendarEntity):
+    """Every practice, qualifying, sprint and race session as an event.
+
+    Range queries are answered by binary search over the schedule index the
+    race coordinator keeps; events are built once per session and schedule.
+    """
+
+    def __init__(self, coordinator, name):
+        super().__init__(coordinator)
+        self._attr_name = name
+        self._attr_unique_id = f"{name}_unique"
+        self._attr_icon = "mdi:calendar-star"
+        self._schedule = None
+        self._events = {}
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        # The current event changes at every session start and end.
+        self.async_on_remove(
+            self.coordinator.scheduler.async_track(
+                self._async_boundary, (BOUNDARY_SESSION_START, BOUNDARY_SESSION_END)
+            )
+        )
+
+    @callback
+    def _async_boundary(self, now):
+        self.async_write_ha_state()
+
+    def _event(self, session):
+        schedule = self.coordinator.schedule
+        if schedule is not self._schedule:
+            self._schedule = schedule
+            self._events = {}
+        event = self._events.get(session)
+        if event is None:
+            race = session.race
+            circuit = race.circuit
+            event = self._events[session] = CalendarEvent(
+                start=session.start,
+                end=session.end,
+                summary=f"{race.name} - {SESSION_NAMES[session.kind]}",
+                location=", ".join(part for part in (circuit.name, circuit.locality, circuit.country) if part),
+                description=f"Round {race.round} of the {race.season} season",
+                uid=f"{race.season}-{race.round}-{session.kind}",
+            )
+        return event
+
+    @property
+    def event(self):
+        schedule = self.coordinator.schedule
+        session = schedule.current_session() or schedule.next_session()
+        return self._event(session) if session else None
+
+    async def async_get_events(self, hass: HomeAssistant, start_date, end_date):
+        sessions = self.coordinator.schedule.sessions_overlapping(start_date, end_date)
+        return [self._event(session) for session in sessions]
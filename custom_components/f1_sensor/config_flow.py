@@ -40,8 +40,20 @@ class F1FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 "last_race_results": "Last race results",
                 "last_qualifying_results": "Last qualifying results",
                 "season_results": "Season results",
+                "sprint_results": "Sprint results",
                 "race_week": "Race week",
+                "current_session": "Current session",
+                "calendar": "Calendar",
+                "live_track_status": "Live track status",
+                "live_positions": "Live positions",
+                "live_race_control": "Live race control messages",
+                "points_progression": "Points progression",
+                "championship_gaps": "Championship gaps",
+                "teammate_head_to_head": "Teammate head-to-head",
+                "title_fight": "Title fight",
             }),
+            vol.Optional("compact_attributes", default=False): cv.boolean,
+            vol.Optional("diagnostic_sensors", default=False): cv.boolean,
         })
 
         return self.async_show_form(
@@ -55,10 +67,13 @@ class F1FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             entry = self._get_reconfigure_entry()
-            return self.async_update_reload_and_abort(
-                entry,
-                data_updates=user_input,
+            # The update listener starts or stops only the coordinators and
+            # sensors whose selection changed, and reloads only for a new
+            # sensor name or attribute mode.
+            self.hass.config_entries.async_update_entry(
+                entry, data={**entry.data, **user_input}
             )
+            return self.async_abort(reason="reconfigure_successful")
 
         entry = self._get_reconfigure_entry()
         current = entry.data
@@ -86,8 +101,24 @@ class F1FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 "last_race_results": "Last race results",
                 "last_qualifying_results": "Last qualifying results",
                 "season_results": "Season results",
+                "sprint_results": "Sprint results",
                 "race_week": "Race week",
+                "current_session": "Current session",
+                "calendar": "Calendar",
+                "live_track_status": "Live track status",
+                "live_positions": "Live positions",
+                "live_race_control": "Live race control messages",
+                "points_progression": "Points progression",
+                "championship_gaps": "Championship gaps",
+                "teammate_head_to_head": "Teammate head-to-head",
+                "title_fight": "Title fight",
             }),
+            vol.Optional(
+                "compact_attributes", default=current.get("compact_attributes", False)
+            ): cv.boolean,
+            vol.Optional(
+                "diagnostic_sensors", default=current.get("diagnostic_sensors", False)
+            ): cv.boolean,
         })
 
         return self.async_show_form(
@@ -1,9 +1,120 @@
+from datetime import timedelta
+
 DOMAIN = "f1_sensor_test"
-PLATFORMS = ["sensor"]
+PLATFORMS = ["sensor", "calendar"]
 
 API_URL = "https://api.jolpi.ca/ergast/f1/current.json"
 DRIVER_STANDINGS_URL = "https://api.jolpi.ca/ergast/f1/current/driverstandings.json"
 CONSTRUCTOR_STANDINGS_URL = "https://api.jolpi.ca/ergast/f1/current/constructorstandings.json"
 LAST_RACE_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/last/results.json"
+QUALIFYING_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/{round}/qualifying.json"
 # LAST_QUALIFYING_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/last/qualifying.json"
-SEASON_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/results.json?limit=100"
+SEASON_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/results.json"
+SPRINT_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/sprint.json"
+SEASON_QUALIFYING_URL = "https://api.jolpi.ca/ergast/f1/current/qualifying.json"
+ROUND_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/{round}/results.json"
+ROUND_SPRINT_RESULTS_URL = "https://api.jolpi.ca/ergast/f1/current/{round}/sprint.json"
+
+# Coordinators in start order. "race" is the season schedule, which every
+# other endpoint needs for its poll timing.
+ENDPOINTS = (
+    "race", "driver", "constructor", "last_race", "last_qualifying", "season_results", "sprint_results",
+    "season_qualifying", "analytics", "live",
+)
+
+# The analytics are derived from every round of these, without requests of
+# their own; the key shares them across config entries.
+ANALYTICS_ENDPOINTS = ("race", "season_results", "sprint_results", "season_qualifying", "analytics")
+ANALYTICS_KEY = f"{DOMAIN}_analytics"
+
+# Sensor key -> endpoints it needs; the last one is the coordinator it reads.
+SENSOR_ENDPOINTS = {
+    "next_race": ("race",),
+    "current_season": ("race",),
+    "driver_standings": ("race", "driver"),
+    "constructor_standings": ("race", "constructor"),
+    "weather": ("race",),
+    "last_race_results": ("race", "last_race"),
+    "last_qualifying_results": ("race", "last_qualifying"),
+    "season_results": ("race", "season_results"),
+    "sprint_results": ("race", "sprint_results"),
+    "race_week": ("race",),
+    "current_session": ("race",),
+    "calendar": ("race",),
+    "live_track_status": ("race", "live"),
+    "live_positions": ("race", "live"),
+    "live_race_control": ("race", "live"),
+    "points_progression": ANALYTICS_ENDPOINTS,
+    "championship_gaps": ANALYTICS_ENDPOINTS,
+    "teammate_head_to_head": ANALYTICS_ENDPOINTS,
+    "title_fight": ANALYTICS_ENDPOINTS,
+}
+
+REQUEST_TIMEOUT = 10
+REQUEST_RETRIES = 2
+REQUEST_RETRY_DELAY = 2
+# Budgets per host as (requests, seconds) windows, shared by every
+# coordinator and config entry; Jolpica allows 4 a second and 500 an hour,
+# and the live timing budget only paces reconnects.
+RATE_LIMITS = {
+    "api.jolpi.ca": ((4, 1), (500, 3600)),
+    "api.met.no": ((20, 1),),
+    "livetiming.formula1.com": ((10, 60),),
+}
+# Requests waiting for a host's budget are served in this order.
+PRIORITY_SCHEDULE = 0
+PRIORITY_RESULTS = 1
+PRIORITY_STANDINGS = 2
+# A Retry-After longer than this fails the request instead of waiting it out.
+RETRY_AFTER_MAX = 300
+# Bodies larger than this are decoded in the executor instead of on the loop.
+DECODE_EXECUTOR_THRESHOLD = 64 * 1024
+
+# Paginated endpoints: rows per page (the API maximum) and pages in flight.
+PAGE_LIMIT = 100
+PAGE_CONCURRENCY = 4
+
+# Results of a round are refetched until this long after its session ended,
+# to pick up penalties and disqualifications; after that they are final.
+RESULTS_FINAL_AFTER = timedelta(days=4)
+
+STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 10
+
+SCHEDULE_REFRESH_INTERVAL = timedelta(hours=12)
+POLL_MIN_INTERVAL = timedelta(minutes=5)
+POLL_CATCH_UP_MAX = timedelta(hours=1)
+POLL_CATCH_UP_WINDOW = timedelta(days=1)
+POLL_IDLE_MAX = timedelta(days=1)
+
+WEATHER_URL = "https://api.met.no/weatherapi/locationforecast/2.0/compact?lat={lat}&lon={lon}"
+WEATHER_USER_AGENT = "homeassistant-f1_sensor"
+WEATHER_MIN_INTERVAL = timedelta(minutes=10)
+WEATHER_MAX_INTERVAL = timedelta(hours=2)
+
+# F1 live timing feed, a legacy SignalR hub. Only connected from
+# LIVE_PRE_SESSION before a scheduled session until LIVE_POST_SESSION after it.
+LIVE_TIMING_URL = "https://livetiming.formula1.com/signalr"
+LIVE_HUB = "Streaming"
+LIVE_TOPICS = (
+    "Heartbeat",
+    "SessionInfo",
+    "SessionStatus",
+    "DriverList",
+    "LapCount",
+    "TimingData",
+    "TrackStatus",
+    "RaceControlMessages",
+)
+LIVE_PRE_SESSION = timedelta(minutes=15)
+LIVE_POST_SESSION = timedelta(minutes=30)
+# Entities are updated at most this often (seconds), with every delta since
+# the last update applied.
+LIVE_UPDATE_INTERVAL = 1
+# The feed sends a keepalive every few seconds; silence this long means the
+# connection is dead.
+LIVE_RECEIVE_TIMEOUT = 60
+LIVE_RECONNECT_MAX = 60
+LIVE_MESSAGES_KEPT = 10
+
+SIGNAL_SENSORS_CHANGED = f"{DOMAIN}_{{}}_sensors_changed"
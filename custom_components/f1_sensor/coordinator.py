@@ -0,0 +1,605 @@
+"""Data update coordinators for the Jolpica-F1 endpoints."""
+import asyncio
+import logging
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.json import json_bytes_sorted
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util, slugify
+
+from .api import F1ApiClient, F1ApiError, F1ApiResponse, fingerprint
+from .const import (
+    CACHE_SAVE_DELAY,
+    DOMAIN,
+    PAGE_CONCURRENCY,
+    PAGE_LIMIT,
+    PRIORITY_RESULTS,
+    PRIORITY_SCHEDULE,
+    QUALIFYING_RESULTS_URL,
+    RESULTS_FINAL_AFTER,
+    SCHEDULE_REFRESH_INTERVAL,
+    STORAGE_VERSION,
+)
+from .polling import AdaptivePolling
+from .model import Race, RaceTable
+from .schedule import ScheduleIndex
+from .scheduler import SessionScheduler
+from .stats import EndpointStats
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_COORDINATORS = f"{DOMAIN}_coordinators"
+
+
+@callback
+def async_acquire_coordinator(hass: HomeAssistant, key, factory):
+    """Return the coordinator for ``key``, creating it with ``factory`` on first use.
+
+    Coordinators are shared by every config entry that needs the same endpoint
+    and reference counted, so the last release shuts the coordinator down.
+    """
+    coordinators = hass.data.setdefault(DATA_COORDINATORS, {})
+    coordinator = coordinators.get(key)
+    if coordinator is None:
+        coordinator = coordinators[key] = factory()
+    coordinator.users += 1
+    return coordinator
+
+
+@callback
+def async_release_coordinator(hass: HomeAssistant, coordinator):
+    coordinator.users -= 1
+    if coordinator.users > 0:
+        return
+    coordinators = hass.data.get(DATA_COORDINATORS, {})
+    if coordinators.get(coordinator.key) is coordinator:
+        del coordinators[coordinator.key]
+    hass.async_create_task(coordinator.async_shutdown())
+
+
+class F1BaseCoordinator(DataUpdateCoordinator):
+    """What the coordinator registry, diagnostics and entities expect of every coordinator.
+
+    ``key`` is the registry key and ``users`` its reference count;
+    ``data_version`` is bumped whenever the data changes. Coordinators are
+    shared by config entries, so none of them owns one: it is not bound to
+    the entry that happened to create it, and only the last release shuts
+    it down.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, logger, client: F1ApiClient, key, name, update_interval=None, always_update=True
+    ):
+        super().__init__(
+            hass,
+            logger,
+            config_entry=None,
+            name=name,
+            update_interval=update_interval,
+            always_update=always_update,
+        )
+        self.client = client
+        self.key = key
+        self.users = 0
+        self.data_version = 0
+        self.stats = EndpointStats()
+        self.stale = False
+        self.last_fetched = None
+        self.last_changed = None
+        self.expires = None
+
+
+class F1DataCoordinator(F1BaseCoordinator):
+    """Handles updates from a given F1 endpoint.
+
+    Payloads are parsed into the model and only the model is kept: it is the
+    coordinator's ``data``, and the cache snapshot is serialised back from it.
+    The last good snapshot is persisted so entities can be served from disk at
+    startup, and a failed update keeps serving it (flagged ``stale``) instead
+    of making the entities unavailable.
+
+    An unchanged payload hands out the same model again, so listeners are
+    only called when the data or its availability changed; each entity then
+    checks whether the section it reads did.
+    """
+
+    # Extra headers sent with every request of this coordinator.
+    headers = {}
+    # Order in which requests waiting for the host's budget are served.
+    priority = PRIORITY_RESULTS
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: F1ApiClient,
+        url: str,
+        name: str,
+        polling=None,
+        store_key=None,
+        model=RaceTable,
+        priority=None,
+    ):
+        super().__init__(
+            hass, _LOGGER, client, url, name, update_interval=timedelta(hours=1), always_update=False
+        )
+        self._model = model
+        if priority is not None:
+            self.priority = priority
+        self._url = url
+        self._polling = polling
+        self._starting = None
+        # url -> last 200 response, kept for conditional requests and to
+        # recognise an identical body; parsed responses keep only the model.
+        self._validated = {}
+        # Section fingerprints, memoised per data version.
+        self._sections = {}
+        # Same as ``data``, but an empty model until the first payload.
+        self.model = self._parse(None)
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{store_key or slugify(name)}")
+
+    async def async_start(self, required=False):
+        """Serve the cached snapshot and revalidate in the background, or refresh now.
+
+        Concurrent callers, such as several config entries setting up at once,
+        share one start. With ``required`` a start that produced no data raises
+        ConfigEntryNotReady.
+        """
+        if self._starting is None or (self._starting.done() and self.data is None):
+            self._starting = self.hass.async_create_task(self._async_start())
+        await asyncio.shield(self._starting)
+        if required and self.data is None:
+            raise ConfigEntryNotReady(f"No data available from {self.name}")
+
+    async def _async_start(self):
+        if await self.async_restore():
+            self.hass.async_create_background_task(
+                self.async_refresh(), f"{self.name} revalidation"
+            )
+        else:
+            await self.async_refresh()
+
+    async def async_restore(self):
+        """Load the cached snapshot; return True if entities can be served from it."""
+        cached = await self._store.async_load()
+        if not cached:
+            return False
+        model = self._parse(cached["data"])
+        if not self._restore(cached["url"], model):
+            return False
+        self._validated[cached["url"]] = F1ApiResponse(
+            200,
+            etag=cached.get("etag"),
+            last_modified=cached.get("last_modified"),
+            size=cached.get("size", 0),
+            fingerprint=cached.get("fingerprint"),
+            model=model,
+        )
+        self.data = model
+        self._set_version(model)
+        self.last_fetched = dt_util.parse_datetime(cached["fetched"])
+        self.last_changed = self.last_fetched
+        expires = cached.get("expires")
+        self.expires = dt_util.parse_datetime(expires) if expires else None
+        self.stale = True
+        _LOGGER.debug("%s restored from cache fetched at %s", self.name, cached["fetched"])
+        return True
+
+    def _restore(self, url, model):
+        return url == self._url
+
+    def _cache_snapshot(self):
+        validated = self._validated.get(self._url)
+        return {
+            "url": self._url,
+            "fetched": self.last_fetched.isoformat(),
+            "etag": validated.etag if validated else None,
+            "last_modified": validated.last_modified if validated else None,
+            "expires": self.expires.isoformat() if self.expires else None,
+            "size": validated.size if validated else 0,
+            "fingerprint": validated.fingerprint if validated else None,
+            "data": self.model.as_payload(),
+        }
+
+    async def _async_update_data(self):
+        try:
+            data = await self._async_fetch_data()
+        except UpdateFailed as err:
+            self._update_poll_interval()
+            if self.data is None:
+                raise
+            if not self.stale:
+                _LOGGER.warning("Updating %s failed, keeping cached data: %s", self.name, err)
+                self.stale = True
+                # The data is unchanged, so only this announces it went stale.
+                self.async_update_listeners()
+            return self.data
+        recovered = self.stale and data is self.data
+        self.stale = False
+        if recovered:
+            self.async_update_listeners()
+        self.last_fetched = dt_util.utcnow()
+        if data is not self.data:
+            self._set_version(data)
+            self.last_changed = self.last_fetched
+            self._store.async_delay_save(self._cache_snapshot, CACHE_SAVE_DELAY)
+        self._update_poll_interval()
+        return data
+
+    def _set_version(self, model):
+        self.data_version += 1
+        self._sections = {}
+        self.model = model
+
+    def _parse(self, data):
+        """Parse a payload into the model.
+
+        Runs in the executor when passed to a fetch of a large body, so it
+        must not touch state the event loop uses; the model's intern tables
+        are shared but locked.
+        """
+        return self._model.from_payload(data)
+
+    def section_fingerprint(self, key, extract):
+        """Fingerprint of ``extract(model)``, computed once per payload version.
+
+        Entities reading the same part of the payload share ``key``.
+        """
+        value = self._sections.get(key)
+        if value is None:
+            value = self._sections[key] = fingerprint(json_bytes_sorted(extract(self.model)))
+        return value
+
+    def _update_poll_interval(self):
+        if self._polling is None:
+            return
+        self.update_interval = self._polling.next_interval(self.last_changed, dt_util.utcnow())
+        _LOGGER.debug("Next poll of %s in %s", self.name, self.update_interval)
+
+    async def _async_fetch_data(self):
+        """Fetch data from the F1 API."""
+        return await self._async_fetch(self._url, self._parse)
+
+    async def _async_fetch(self, url, parse=None):
+        """Return the model of ``url`` parsed with ``parse``, or its decoded body without one.
+
+        An unchanged body returns the object handed out before.
+        """
+        cached = self._validated.get(url)
+        headers = dict(self.headers)
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        try:
+            response = await self.client.async_get(
+                url, headers=headers, parse=parse, stats=self.stats, priority=self.priority
+            )
+        except F1ApiError as err:
+            raise UpdateFailed(f"Error fetching data: {err}") from err
+
+        stats = self.stats
+        if not response.not_modified:
+            stats.last_decode_time = response.decode_time
+            stats.decode_time_total += response.decode_time
+            _LOGGER.debug(
+                "%s decoded %s bytes in %.1f ms", url, response.size, response.decode_time * 1000
+            )
+
+        self.expires = response.expires
+        if response.not_modified and cached is not None:
+            stats.not_modified += 1
+            stats.bytes_saved += cached.size
+            stats.decode_time_saved += cached.decode_time
+            _LOGGER.debug(
+                "%s not modified; saved %s bytes and %.1f ms decode (total %s bytes, %.1f ms)",
+                url, cached.size, cached.decode_time * 1000, stats.bytes_saved, stats.decode_time_saved * 1000,
+            )
+            return cached.model if parse is not None else cached.data
+        if response.not_modified:
+            raise UpdateFailed(f"Unexpected 304 without a cached response for {url}")
+        if cached is not None and cached.fingerprint == response.fingerprint:
+            # Same body without validators: keep the object already handed out
+            # so nothing downstream sees a change.
+            stats.unchanged += 1
+            cached.etag = response.etag
+            cached.last_modified = response.last_modified
+            return cached.model if parse is not None else cached.data
+
+        self._validated[url] = response
+        if parse is not None:
+            response.data = None
+            return response.model
+        return response.data
+
+
+def _merge_pages(pages):
+    """Merge the pages of a results endpoint back into one race per round.
+
+    A race whose rows straddle a page boundary appears on both pages; its
+    ``*Results`` lists are concatenated in page order.
+    """
+    races = {}
+    for page in pages:
+        for race in page.get("MRData", {}).get("RaceTable", {}).get("Races", []):
+            merged = races.get(race.get("round"))
+            if merged is None:
+                races[race.get("round")] = dict(race)
+                continue
+            for key, rows in race.items():
+                if key.endswith("Results"):
+                    merged[key] = merged.get(key, []) + rows
+    mrdata = dict(pages[0].get("MRData", {}))
+    table = dict(mrdata.get("RaceTable", {}))
+    table["Races"] = sorted(races.values(), key=lambda race: int(race.get("round", 0)))
+    mrdata.update(RaceTable=table, limit=mrdata.get("total"), offset="0")
+    return {"MRData": mrdata}
+
+
+class F1PagedCoordinator(F1DataCoordinator):
+    """Fetches every page of a paginated results endpoint.
+
+    The first page reports ``MRData.total``; the remaining offsets are fetched
+    concurrently, at most PAGE_CONCURRENCY at a time, and merged per round.
+    Each page is revalidated on its own, so an unchanged season costs one
+    conditional request per page.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, client: F1ApiClient, url: str, name: str, polling=None, store_key=None
+    ):
+        super().__init__(hass, client, url, name, polling, store_key)
+        self._pages = []
+
+    def _page_url(self, offset, limit=PAGE_LIMIT):
+        return f"{self._url}?limit={limit}&offset={offset}"
+
+    async def _async_fetch_data(self):
+        first = await self._async_fetch(self._page_url(0))
+        mrdata = first.get("MRData", {})
+        total = int(mrdata.get("total", 0))
+        # The server may cap the page size below what was asked for.
+        limit = int(mrdata.get("limit", PAGE_LIMIT)) or PAGE_LIMIT
+        semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+        async def _async_page(offset):
+            async with semaphore:
+                return await self._async_fetch(self._page_url(offset, limit))
+
+        rest = await asyncio.gather(*(_async_page(offset) for offset in range(limit, total, limit)))
+        pages = [first, *rest]
+        if (
+            self.data is not None
+            and len(pages) == len(self._pages)
+            and all(page is old for page, old in zip(pages, self._pages))
+        ):
+            return self.data
+        self._pages = pages
+        _LOGGER.debug("%s merged %s rows from %s pages", self.name, total, len(pages))
+        return self._parse(_merge_pages(pages))
+
+
+class F1RaceCoordinator(F1DataCoordinator):
+    """Season schedule coordinator that keeps a parsed schedule index.
+
+    Its scheduler wakes entities at session and calendar boundaries, which
+    move them without the schedule itself changing.
+    """
+
+    priority = PRIORITY_SCHEDULE
+
+    def __init__(self, hass: HomeAssistant, client: F1ApiClient, url: str, name: str):
+        super().__init__(hass, client, url, name)
+        self.update_interval = SCHEDULE_REFRESH_INTERVAL
+        self.schedule = ScheduleIndex.from_table(self.model)
+        self.scheduler = SessionScheduler(hass, self)
+
+    def _set_version(self, data):
+        super()._set_version(data)
+        self.schedule = ScheduleIndex.from_table(self.model)
+        self.scheduler.async_rearm()
+
+    async def async_shutdown(self):
+        self.scheduler.async_cancel()
+        await super().async_shutdown()
+
+
+class F1QualifyingCoordinator(F1DataCoordinator):
+    """Follows the latest round that has qualifying results.
+
+    The first refresh bisects the rounds whose qualifying has started according
+    to the schedule; later refreshes only probe the round after the known one.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, client: F1ApiClient, race_coordinator: F1RaceCoordinator, name: str
+    ):
+        super().__init__(
+            hass,
+            client,
+            QUALIFYING_RESULTS_URL.format(round=1),
+            name,
+            AdaptivePolling(race_coordinator, ("qualifying",)),
+        )
+        # The URL follows the round, so the coordinator is keyed by the template.
+        self.key = QUALIFYING_RESULTS_URL
+        self._race_coordinator = race_coordinator
+        self._season = None
+        self._round_model = self.model
+        self.round = None
+
+    async def _async_probe(self, round_num):
+        model = await self._async_fetch(QUALIFYING_RESULTS_URL.format(round=round_num), self._parse)
+        return model if model.races else None
+
+    async def _async_search(self, upper):
+        lo, hi, found = 0, upper, None
+        # Results are normally published right after the session, so the most
+        # recent round is tried first and the search only bisects on a miss.
+        mid = upper
+        while lo < hi:
+            model = await self._async_probe(mid)
+            if model:
+                lo, found = mid, model
+            else:
+                hi = mid - 1
+            mid = (lo + hi + 1) // 2
+        return lo, found
+
+    def _restore(self, url, model):
+        if not model.races:
+            return False
+        self._url = url
+        self._season = model.season
+        self.round = int(model.races[0].round)
+        self._round_model = model
+        return True
+
+    async def _async_fetch_data(self):
+        schedule = self._race_coordinator.schedule
+        upper = schedule.latest_round("qualifying") or 0
+        if schedule.season != self._season or (self.round or 0) > upper:
+            self._season = schedule.season
+            self.round = None
+            self._round_model = self._parse(None)
+
+        if self.round is None:
+            self.round, found = await self._async_search(upper)
+            self._round_model = found or self._round_model
+            _LOGGER.debug("Latest qualifying with results: round %s", self.round)
+        else:
+            # The search has already probed every round up to ``upper``.
+            while self.round < upper:
+                model = await self._async_probe(self.round + 1)
+                if not model:
+                    break
+                self.round += 1
+                self._round_model = model
+                _LOGGER.debug("Qualifying results advanced to round %s", self.round)
+
+        self._url = QUALIFYING_RESULTS_URL.format(round=self.round or 1)
+        return self._round_model
+
+
+class F1RoundResultsCoordinator(F1PagedCoordinator):
+    """Season results kept as a persisted, round-keyed store.
+
+    Only rounds whose session has ended and that are not final yet are
+    fetched, one ``{round}`` URL each; a round becomes final once it is
+    fetched more than RESULTS_FINAL_AFTER after its session ended. An empty
+    store is filled from the paginated season endpoint instead. Between
+    weekends a refresh makes no requests at all.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: F1ApiClient,
+        race_coordinator: F1RaceCoordinator,
+        url: str,
+        round_url: str,
+        name: str,
+        kind: str,
+    ):
+        super().__init__(
+            hass, client, url, name, AdaptivePolling(race_coordinator, (kind,)), f"{slugify(name)}_rounds"
+        )
+        self._race_coordinator = race_coordinator
+        self._round_url = round_url
+        self._kind = kind
+        self._season = None
+        # round -> parsed race; unchanged rounds keep their instance.
+        self._rounds = {}
+        self._final = set()
+
+    async def _async_start(self):
+        # Which rounds to fetch comes from the schedule.
+        await self._race_coordinator.async_start()
+        await super()._async_start()
+
+    async def async_restore(self):
+        cached = await self._store.async_load()
+        if not cached or not cached.get("rounds"):
+            return False
+        self._season = cached["season"]
+        self._rounds = {round_: Race(race) for round_, race in cached["rounds"].items()}
+        self._final = set(cached["final"])
+        self.data = self._view()
+        self._set_version(self.data)
+        self.last_fetched = self.last_changed = dt_util.parse_datetime(cached["fetched"])
+        self.stale = True
+        _LOGGER.debug("%s restored %s rounds (%s final)", self.name, len(self._rounds), len(self._final))
+        return True
+
+    def _cache_snapshot(self):
+        return {
+            "season": self._season,
+            "fetched": self.last_fetched.isoformat(),
+            "final": sorted(self._final, key=int),
+            "rounds": {round_: race.as_ergast(results=True) for round_, race in self._rounds.items()},
+        }
+
+    def _view(self):
+        races = sorted(self._rounds.values(), key=lambda race: int(race.round or 0))
+        return RaceTable(self._season, tuple(races))
+
+    async def _async_fetch_round(self, round_):
+        url = self._round_url.format(round=round_)
+        model = await self._async_fetch(url, self._parse)
+        return model.races[0] if model.races else None
+
+    async def _async_fetch_data(self):
+        schedule = self._race_coordinator.schedule
+        if not schedule:
+            raise UpdateFailed("Season schedule not available yet")
+        if schedule.season != self._season:
+            self._season = schedule.season
+            self._rounds = {}
+            self._final = set()
+            self._validated = {}
+
+        now = dt_util.utcnow()
+        pending = {
+            session.round: session.end
+            for session in schedule.past_sessions(self._kind, now)
+            if session.end <= now and session.round not in self._final
+        }
+        if not pending:
+            return self.data if self.data is not None else self._view()
+
+        changed = finalized = False
+        if len(pending) > 1 and not self._rounds:
+            merged = await super()._async_fetch_data()
+            found = {race.round: race for race in merged.races}
+            self._validated = {}
+            self._pages = []
+        else:
+            semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+            async def _async_round(round_):
+                async with semaphore:
+                    return await self._async_fetch_round(round_)
+
+            races = await asyncio.gather(*(_async_round(round_) for round_ in pending))
+            found = {round_: race for round_, race in zip(pending, races) if race is not None}
+
+        for round_, race in found.items():
+            if round_ not in pending:
+                continue
+            if self._rounds.get(round_) is not race:
+                self._rounds[round_] = race
+                changed = True
+            if pending[round_] + RESULTS_FINAL_AFTER <= now:
+                self._final.add(round_)
+                finalized = True
+                self._validated.pop(self._round_url.format(round=round_), None)
+                _LOGGER.debug("%s round %s is final", self.name, round_)
+
+        if not changed and self.data is not None:
+            if finalized:
+                self._store.async_delay_save(self._cache_snapshot, CACHE_SAVE_DELAY)
+            return self.data
+        return self._view()
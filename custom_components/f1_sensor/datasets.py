@@ -0,0 +1,85 @@
+"""Full datasets built from the parsed coordinator models.
+
+Sensors expose these as attributes unless compact attributes are enabled;
+the ``get_dataset`` service serves them on demand either way.
+"""
+
+
+def current_season(table):
+    return {
+        "season": table.season,
+        "races": [race.as_ergast() for race in table.races],
+    }
+
+
+def _standings(table, key):
+    if not table.standings:
+        return {}
+    return {
+        "season": table.season,
+        "round": table.round,
+        key: [standing.as_ergast() for standing in table.standings],
+    }
+
+
+def driver_standings(table):
+    return _standings(table, "driver_standings")
+
+
+def constructor_standings(table):
+    return _standings(table, "constructor_standings")
+
+
+def last_race_results(table):
+    if not table.races:
+        return {}
+    race = table.races[0]
+    return {
+        "round": race.round,
+        "race_name": race.name,
+        "results": [r.as_dict() for r in race.results],
+    }
+
+
+def last_qualifying_results(table):
+    if not table.races:
+        return {}
+    race = table.races[0]
+    return {
+        "round": race.round,
+        "race_name": race.name,
+        "results": [r.as_dict() for r in race.qualifying_results],
+    }
+
+
+def season_results(table, sprint=False):
+    return {
+        "races": [
+            {
+                "round": race.round,
+                "race_name": race.name,
+                "results": [r.as_dict() for r in (race.sprint_results if sprint else race.results)],
+            }
+            for race in table.races
+        ]
+    }
+
+
+def sprint_results(table):
+    return season_results(table, sprint=True)
+
+
+# Sensor key -> builder of its full dataset.
+DATASETS = {
+    "current_season": current_season,
+    "driver_standings": driver_standings,
+    "constructor_standings": constructor_standings,
+    "last_race_results": last_race_results,
+    "last_qualifying_results": last_qualifying_results,
+    "season_results": season_results,
+    "sprint_results": sprint_results,
+}
+
+# Attributes that hold a full dataset. They are never recorded, and left out
+# of the state altogether in compact mode.
+HEAVY_ATTRIBUTES = frozenset({"races", "driver_standings", "constructor_standings", "results"})
@@ -0,0 +1,56 @@
+"""Diagnostics download: request statistics per endpoint and host, and attribute sizes per entity."""
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import async_get_client
+from .const import DOMAIN
+from .coordinator import DATA_COORDINATORS
+from .weather import F1WeatherCoordinator
+
+
+def _coordinator_diagnostics(coordinator):
+    return {
+        "name": coordinator.name,
+        "url": coordinator.key,
+        "users": coordinator.users,
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+        "update_interval_s": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        "last_fetched": coordinator.last_fetched.isoformat() if coordinator.last_fetched else None,
+        "last_changed": coordinator.last_changed.isoformat() if coordinator.last_changed else None,
+        "expires": coordinator.expires.isoformat() if coordinator.expires else None,
+        "data_version": coordinator.data_version,
+        "stats": coordinator.stats.as_dict(),
+    }
+
+
+def _host_diagnostics(hass: HomeAssistant):
+    """Request budget and queue of every rate limited host, shared by all entries."""
+    return {host: limiter.as_dict() for host, limiter in async_get_client(hass).limiters.items()}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    data = hass.data[DOMAIN][entry.entry_id]
+    # Forecast coordinators follow the next circuit and are shared by all entries.
+    weather = [
+        coordinator
+        for coordinator in hass.data.get(DATA_COORDINATORS, {}).values()
+        if isinstance(coordinator, F1WeatherCoordinator)
+    ]
+    return {
+        "entry": dict(entry.data),
+        "endpoints": {
+            endpoint: _coordinator_diagnostics(coordinator)
+            for endpoint, coordinator in data["coordinators"].items()
+        },
+        "weather": [_coordinator_diagnostics(coordinator) for coordinator in weather],
+        "hosts": _host_diagnostics(hass),
+        "entities": {
+            entity.entity_id: {
+                "coordinator": entity.coordinator.name,
+                "attribute_bytes": entity.attributes_size(),
+            }
+            for entity in data.get("entities", {}).values()
+            if entity.hass is not None
+        },
+    }
@@ -0,0 +1,124 @@
+"""Base entity for sensors fed by an F1 coordinator."""
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .datasets import HEAVY_ATTRIBUTES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class F1CoordinatorEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when its input changed.
+
+    Coordinators only call their listeners when the data or its
+    availability changed. The entity then compares availability and a
+    fingerprint of the part of the model it reads with what it last wrote,
+    and skips recomputing and writing its state when both are unchanged.
+    Entities whose output depends on the time are woken by the race
+    coordinator's scheduler at the ``_boundaries`` they name.
+    """
+
+    # Full datasets are served by the get_dataset service and never recorded.
+    _unrecorded_attributes = HEAVY_ATTRIBUTES
+
+    # Set from the config entry: expose summaries instead of full datasets.
+    compact = False
+
+    # Schedule boundaries (scheduler.BOUNDARY_*) at which the output changes.
+    _boundaries = ()
+
+    _written = None
+    # (data version, state, attributes) of the last projection.
+    _projection = None
+    # (written token, projection, size) of the last attribute measurement.
+    _measured = None
+
+    def _section_key(self):
+        """Key of the model section this entity reads, or None for all of it.
+
+        Entities with the same key must read the same section; include
+        anything time dependent the output relies on.
+        """
+        return None
+
+    def _section(self, data):
+        """The section named by ``_section_key``; by default the whole payload."""
+        return data.as_payload()
+
+    def _compute_state(self):
+        return None
+
+    def _compute_attributes(self):
+        return None
+
+    def _project(self):
+        """Compute state and attributes once per data version and schedule boundary.
+
+        HA reads state and attributes several times per write, and again for
+        templates and diagnostics; they are served from the cache until the
+        coordinator data changes or a tracked boundary passes.
+        """
+        version = self.coordinator.data_version
+        cached = self._projection
+        if cached is not None and cached[0] == version:
+            return cached
+        self._projection = cached = (version, self._compute_state(), self._compute_attributes())
+        return cached
+
+    @property
+    def state(self):
+        return self._project()[1]
+
+    @property
+    def extra_state_attributes(self):
+        return self._project()[2]
+
+    def attributes_size(self):
+        """Bytes of the attributes as serialized into the state machine.
+
+        Measured once per written state and projection, for diagnostics.
+        """
+        attributes = self.extra_state_attributes or {}
+        measured = self._measured
+        if measured is None or measured[0] != self._written or measured[1] is not self._projection:
+            self._measured = measured = (self._written, self._projection, len(json_bytes(attributes)))
+        return measured[2]
+
+    def _update_token(self):
+        coordinator = self.coordinator
+        key = self._section_key()
+        if key is None:
+            version = coordinator.data_version
+        else:
+            version = coordinator.section_fingerprint(key, self._section)
+        return coordinator.last_update_success, version
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self._written = self._update_token()
+        if self._boundaries:
+            self.async_on_remove(
+                self.coordinator.scheduler.async_track(self._async_boundary, self._boundaries)
+            )
+
+    @callback
+    def _async_boundary(self, now):
+        self._projection = None
+        self._written = self._update_token()
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self):
+        token = self._update_token()
+        if token == self._written:
+            self.coordinator.stats.skipped_writes += 1
+            _LOGGER.debug(
+                "%s unchanged, skipped write (%s skipped on %s)",
+                self.entity_id, self.coordinator.stats.skipped_writes, self.coordinator.name,
+            )
+            return
+        self._written = token
+        super()._handle_coordinator_update()
@@ -0,0 +1,341 @@
+"""Push-based session state from the F1 live timing feed."""
+import asyncio
+import base64
+import json
+import logging
+import time
+import zlib
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .api import F1ApiClient
+from .const import (
+    LIVE_HUB,
+    LIVE_POST_SESSION,
+    LIVE_PRE_SESSION,
+    LIVE_RECEIVE_TIMEOUT,
+    LIVE_RECONNECT_MAX,
+    LIVE_TIMING_URL,
+    LIVE_TOPICS,
+    LIVE_UPDATE_INTERVAL,
+    PRIORITY_SCHEDULE,
+    REQUEST_TIMEOUT,
+)
+from .coordinator import F1BaseCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_CONNECTION_DATA = json.dumps([{"name": LIVE_HUB}])
+
+# Raised by a corrupt ``.z`` payload or a delta that does not fit the state.
+_DECODE_ERRORS = (ValueError, KeyError, IndexError, TypeError, AttributeError, zlib.error)
+
+
+def apply_delta(base, delta):
+    """Merge a feed delta into ``base`` and return the result.
+
+    The feed sends changed keys only. Lists are updated through dicts keyed
+    by index, and ``_deleted`` lists keys to drop. ``base`` is updated in
+    place where possible.
+    """
+    if not isinstance(delta, dict):
+        return delta
+    if isinstance(base, list):
+        for key, value in delta.items():
+            i = int(key)
+            if i < len(base):
+                base[i] = apply_delta(base[i], value)
+            else:
+                base.extend([None] * (i - len(base)))
+                base.append(apply_delta(None, value))
+        return base
+    if not isinstance(base, dict):
+        base = {}
+    for key, value in delta.items():
+        if key == "_deleted":
+            for deleted in value:
+                base.pop(str(deleted), None)
+        else:
+            base[key] = apply_delta(base.get(key), value)
+    return base
+
+
+def decode_topic(topic, data):
+    """Return ``(topic, data)`` with ``.z`` topics inflated from base64 deflate."""
+    if topic.endswith(".z"):
+        return topic[:-2], json_loads(zlib.decompress(base64.b64decode(data), -zlib.MAX_WBITS))
+    return topic, data
+
+
+class LiveSession:
+    """In-memory state of the live feed: one snapshot plus every delta since.
+
+    ``versions`` counts the changes per topic, so entities can tell whether
+    the topics they read changed without comparing their content.
+    """
+
+    def __init__(self):
+        self.topics = {}
+        self.versions = {}
+
+    def load(self, snapshot):
+        """Replace the state with a subscription snapshot."""
+        for topic in set(self.topics) | set(self.versions):
+            self.versions[topic] = self.versions.get(topic, 0) + 1
+        self.topics = {}
+        for topic, data in snapshot.items():
+            topic, data = decode_topic(topic, data)
+            self.topics[topic] = apply_delta(None, data)
+            self.versions[topic] = self.versions.get(topic, 0) + 1
+
+    def apply(self, topic, delta):
+        topic, delta = decode_topic(topic, delta)
+        self.topics[topic] = apply_delta(self.topics.get(topic), delta)
+        self.versions[topic] = self.versions.get(topic, 0) + 1
+
+    @property
+    def session_info(self):
+        return self.topics.get("SessionInfo") or {}
+
+    @property
+    def track_status(self):
+        return self.topics.get("TrackStatus") or {}
+
+    @property
+    def lap_count(self):
+        return self.topics.get("LapCount") or {}
+
+    @property
+    def race_control_messages(self):
+        messages = (self.topics.get("RaceControlMessages") or {}).get("Messages") or []
+        return [message for message in messages if message]
+
+    def positions(self):
+        """Timing lines joined with the driver list, in running order."""
+        drivers = self.topics.get("DriverList") or {}
+        lines = (self.topics.get("TimingData") or {}).get("Lines") or {}
+        rows = []
+        for number, line in lines.items():
+            if not isinstance(line, dict):
+                continue
+            driver = drivers.get(number) or {}
+            try:
+                position = int(line.get("Position"))
+            except (TypeError, ValueError):
+                position = None
+            rows.append({
+                "position": position,
+                "number": number,
+                "code": driver.get("Tla"),
+                "name": driver.get("FullName"),
+                "team": driver.get("TeamName"),
+                "gap_to_leader": line.get("GapToLeader"),
+                "interval": (line.get("IntervalToPositionAhead") or {}).get("Value"),
+                "last_lap": (line.get("LastLapTime") or {}).get("Value"),
+                "laps": line.get("NumberOfLaps"),
+                "in_pit": line.get("InPit", False),
+                "retired": line.get("Retired", False),
+            })
+        rows.sort(key=lambda row: (row["position"] is None, row["position"] or 0))
+        return rows
+
+
+class F1LiveTimingCoordinator(F1BaseCoordinator):
+    """Keeps a :class:`LiveSession` from the live timing feed.
+
+    The feed is connected only from LIVE_PRE_SESSION before to
+    LIVE_POST_SESSION after a session of the race coordinator's schedule.
+    Deltas are applied as they arrive; listeners are notified at most once
+    every LIVE_UPDATE_INTERVAL with everything that arrived in between.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, client: F1ApiClient, race_coordinator, url: str = LIVE_TIMING_URL
+    ):
+        super().__init__(hass, _LOGGER, client, url, "F1 Live Timing")
+        self._url = url
+        self._race_coordinator = race_coordinator
+        self.session = LiveSession()
+        self.data = self.session
+        self.connected = False
+        self.window = None
+        self._task = None
+        self._unsub_timer = None
+        self._unsub_schedule = None
+        self._notify = Debouncer(
+            hass, _LOGGER, cooldown=LIVE_UPDATE_INTERVAL, immediate=True, function=self._async_notify
+        )
+
+    async def async_start(self, required=False):
+        """Follow the schedule; the feed connects once a session window opens."""
+        if self._unsub_schedule is None:
+            self._unsub_schedule = self._race_coordinator.async_add_listener(self._async_reschedule)
+            self._async_reschedule()
+
+    async def async_shutdown(self):
+        if self._unsub_schedule is not None:
+            self._unsub_schedule()
+            self._unsub_schedule = None
+        self._cancel_timer()
+        self._async_disconnect()
+        self._notify.async_shutdown()
+        await super().async_shutdown()
+
+    async def _async_update_data(self):
+        # Pushed by the feed; a requested refresh has nothing newer to fetch.
+        return self.session
+
+    def _session_window(self, now):
+        """Return ``(start, end)`` of the current or next session window, if any."""
+        schedule = self._race_coordinator.schedule
+        session = schedule.latest_session(now=now + LIVE_PRE_SESSION)
+        if session is None or now >= session.end + LIVE_POST_SESSION:
+            session = schedule.next_session(now + LIVE_PRE_SESSION)
+        if session is None:
+            return None
+        return session.start - LIVE_PRE_SESSION, session.end + LIVE_POST_SESSION
+
+    def _cancel_timer(self):
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_reschedule(self, _now=None):
+        """Connect or disconnect for the current window and wake up at its next edge."""
+        self._cancel_timer()
+        now = dt_util.utcnow()
+        self.window = self._session_window(now)
+        if self.window is None:
+            self._async_disconnect()
+            return
+        start, end = self.window
+        if start <= now:
+            self._async_connect()
+            wake = end
+        else:
+            self._async_disconnect()
+            wake = start
+        self._unsub_timer = async_track_point_in_utc_time(self.hass, self._async_timer, wake)
+
+    @callback
+    def _async_timer(self, now):
+        self._unsub_timer = None
+        self._async_reschedule()
+
+    @callback
+    def _async_connect(self):
+        if self._task is None:
+            _LOGGER.debug("Session window %s - %s open, connecting to live timing", *self.window)
+            self._task = self.hass.async_create_background_task(self._async_run(), f"{self.name} feed")
+
+    @callback
+    def _async_disconnect(self):
+        if self._task is not None:
+            _LOGGER.debug("Session window closed, disconnecting from live timing")
+            self._task.cancel()
+            self._task = None
+        self._set_connected(False)
+
+    def _set_connected(self, connected):
+        if connected != self.connected:
+            self.connected = connected
+            self._notify.async_schedule_call()
+
+    async def _async_run(self):
+        """Stay connected, reconnecting with backoff, until cancelled."""
+        delay = 1
+        while True:
+            connects = self.stats.responses
+            try:
+                await self._async_listen()
+                error = "connection closed"
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                ValueError,
+                KeyError,
+                TypeError,
+                AttributeError,
+                zlib.error,
+            ) as err:
+                error = repr(err)
+            self.stats.record_error(error)
+            self._set_connected(False)
+            if self.stats.responses > connects:
+                delay = 1
+            _LOGGER.debug("Live timing disconnected (%s), reconnecting in %s s", error, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LIVE_RECONNECT_MAX)
+
+    async def _async_listen(self):
+        """Negotiate, connect, subscribe and apply messages until the socket closes."""
+        session = self.client.session
+        params = {"clientProtocol": "1.5", "connectionData": _CONNECTION_DATA}
+        limiter = self.client.limiter(self._url)
+        if limiter is not None:
+            self.stats.queue_time_total += await limiter.acquire(PRIORITY_SCHEDULE)
+        self.stats.requests += 1
+        started = time.monotonic()
+        async with session.get(
+            f"{self._url}/negotiate", params=params, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        ) as resp:
+            resp.raise_for_status()
+            token = (await resp.json(content_type=None))["ConnectionToken"]
+            # The feed sits behind a load balancer that pins the socket with a cookie.
+            cookie = "; ".join(f"{name}={morsel.value}" for name, morsel in resp.cookies.items())
+
+        headers = {"User-Agent": "BestHTTP", "Accept-Encoding": "gzip, identity"}
+        if cookie:
+            headers["Cookie"] = cookie
+        async with session.ws_connect(
+            f"{self._url}/connect",
+            params={**params, "transport": "webSockets", "connectionToken": token},
+            headers=headers,
+            receive_timeout=LIVE_RECEIVE_TIMEOUT,
+        ) as ws:
+            await ws.send_json({"H": LIVE_HUB, "M": "Subscribe", "A": [list(LIVE_TOPICS)], "I": 1})
+            self.stats.record_response(time.monotonic() - started, 0)
+            self._set_connected(True)
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                self.stats.bytes_received += len(msg.data)
+                self._handle_message(json_loads(msg.data))
+
+    def _handle_message(self, message):
+        """Apply a socket message; a malformed or corrupt delta is logged and dropped."""
+        if not isinstance(message, dict):
+            _LOGGER.debug("Dropped live timing frame that is not an object: %r", message)
+            return
+        changed = False
+        if isinstance(message.get("R"), dict):
+            # Reply to Subscribe: the full state of every topic.
+            try:
+                self.session.load(message["R"])
+                changed = True
+            except _DECODE_ERRORS as err:
+                _LOGGER.debug("Dropped malformed live timing snapshot: %r", err)
+        hub_messages = message.get("M")
+        for hub_message in hub_messages if isinstance(hub_messages, list) else ():
+            if isinstance(hub_message, dict) and hub_message.get("M") == "feed":
+                try:
+                    topic, delta = hub_message["A"][:2]
+                    self.session.apply(topic, delta)
+                    changed = True
+                except _DECODE_ERRORS as err:
+                    _LOGGER.debug("Dropped malformed live timing message: %r", err)
+        if changed:
+            self.last_fetched = self.last_changed = dt_util.utcnow()
+            self._notify.async_schedule_call()
+
+    @callback
+    def _async_notify(self):
+        self.data_version += 1
+        self.async_set_updated_data(self.session)
@@ -0,0 +1,422 @@
+"""Compact, typed model of the Jolpica-F1 (Ergast) payloads.
+
+Coordinators parse their payload once per refresh and keep only the model;
+the cache snapshot is serialised back from it. Drivers, constructors and
+circuits are interned, so every endpoint and coordinator shares a single
+instance of each. Payloads are parsed both on the event loop and in the
+executor, so interning is done under a lock.
+"""
+import datetime
+import threading
+import weakref
+
+# Ergast session keys mapped to the names used in sensor attributes.
+SESSION_KEYS = (
+    ("FirstPractice", "first_practice"),
+    ("SecondPractice", "second_practice"),
+    ("ThirdPractice", "third_practice"),
+    ("SprintQualifying", "sprint_qualifying"),
+    ("Sprint", "sprint"),
+    ("Qualifying", "qualifying"),
+)
+RACE = "race"
+
+# Nominal session lengths; Ergast only publishes start times.
+SESSION_DURATIONS = {
+    "first_practice": datetime.timedelta(hours=1),
+    "second_practice": datetime.timedelta(hours=1),
+    "third_practice": datetime.timedelta(hours=1),
+    "sprint_qualifying": datetime.timedelta(minutes=45),
+    "sprint": datetime.timedelta(hours=1),
+    "qualifying": datetime.timedelta(hours=1),
+    RACE: datetime.timedelta(hours=2),
+}
+
+
+def parse_datetime(date_str, time_str):
+    """Combine an Ergast date and time into an aware UTC datetime."""
+    if not date_str:
+        return None
+    if not time_str:
+        time_str = "00:00:00Z"
+    try:
+        return datetime.datetime.fromisoformat(
+            f"{date_str}T{time_str}".replace("Z", "+00:00")
+        )
+    except ValueError:
+        return None
+
+
+def _ergast_datetime(start):
+    return {"date": start.date().isoformat(), "time": start.strftime("%H:%M:%SZ")}
+
+
+# Interned instances, keyed by all their fields so a correction in the API
+# yields a new instance rather than mutating one shared by older payloads.
+_drivers = weakref.WeakValueDictionary()
+_constructors = weakref.WeakValueDictionary()
+_circuits = weakref.WeakValueDictionary()
+_intern_lock = threading.Lock()
+
+
+def _intern(table, cls, values):
+    with _intern_lock:
+        obj = table.get(values)
+        if obj is None:
+            obj = table[values] = cls(*values)
+        return obj
+
+
+class Driver:
+    __slots__ = (
+        "driver_id", "permanent_number", "code", "url", "given_name", "family_name",
+        "date_of_birth", "nationality", "__weakref__",
+    )
+
+    def __init__(self, driver_id, permanent_number, code, url, given_name, family_name, date_of_birth, nationality):
+        self.driver_id = driver_id
+        self.permanent_number = permanent_number
+        self.code = code
+        self.url = url
+        self.given_name = given_name
+        self.family_name = family_name
+        self.date_of_birth = date_of_birth
+        self.nationality = nationality
+
+    @classmethod
+    def from_data(cls, d):
+        return _intern(_drivers, cls, (
+            d.get("driverId"), d.get("permanentNumber"), d.get("code"), d.get("url"),
+            d.get("givenName"), d.get("familyName"), d.get("dateOfBirth"), d.get("nationality"),
+        ))
+
+    def as_dict(self):
+        """The short form used in result attributes."""
+        return {
+            "permanentNumber": self.permanent_number,
+            "code": self.code,
+            "givenName": self.given_name,
+            "familyName": self.family_name,
+        }
+
+    def as_ergast(self):
+        return {
+            "driverId": self.driver_id,
+            "permanentNumber": self.permanent_number,
+            "code": self.code,
+            "url": self.url,
+            "givenName": self.given_name,
+            "familyName": self.family_name,
+            "dateOfBirth": self.date_of_birth,
+            "nationality": self.nationality,
+        }
+
+
+class Constructor:
+    __slots__ = ("constructor_id", "url", "name", "nationality", "__weakref__")
+
+    def __init__(self, constructor_id, url, name, nationality):
+        self.constructor_id = constructor_id
+        self.url = url
+        self.name = name
+        self.nationality = nationality
+
+    @classmethod
+    def from_data(cls, d):
+        return _intern(_constructors, cls, (
+            d.get("constructorId"), d.get("url"), d.get("name"), d.get("nationality"),
+        ))
+
+    def as_dict(self):
+        """The short form used in result attributes."""
+        return {"constructorId": self.constructor_id, "name": self.name}
+
+    def as_ergast(self):
+        return {
+            "constructorId": self.constructor_id,
+            "url": self.url,
+            "name": self.name,
+            "nationality": self.nationality,
+        }
+
+
+class Circuit:
+    __slots__ = ("circuit_id", "url", "name", "lat", "long", "locality", "country", "__weakref__")
+
+    def __init__(self, circuit_id, url, name, lat, long, locality, country):
+        self.circuit_id = circuit_id
+        self.url = url
+        self.name = name
+        self.lat = lat
+        self.long = long
+        self.locality = locality
+        self.country = country
+
+    @classmethod
+    def from_data(cls, d):
+        loc = d.get("Location", {})
+        return _intern(_circuits, cls, (
+            d.get("circuitId"), d.get("url"), d.get("circuitName"),
+            loc.get("lat"), loc.get("long"), loc.get("locality"), loc.get("country"),
+        ))
+
+    def as_ergast(self):
+        return {
+            "circuitId": self.circuit_id,
+            "url": self.url,
+            "circuitName": self.name,
+            "Location": {
+                "lat": self.lat,
+                "long": self.long,
+                "locality": self.locality,
+                "country": self.country,
+            },
+        }
+
+
+class Result:
+    __slots__ = ("position", "position_text", "number", "points", "grid", "laps", "status", "driver", "constructor")
+
+    def __init__(self, d):
+        self.position = d.get("position")
+        self.position_text = d.get("positionText")
+        self.number = d.get("number")
+        self.points = d.get("points")
+        self.grid = d.get("grid")
+        self.laps = d.get("laps")
+        self.status = d.get("status")
+        self.driver = Driver.from_data(d.get("Driver", {}))
+        self.constructor = Constructor.from_data(d.get("Constructor", {}))
+
+    def as_dict(self):
+        return {
+            "number": self.number,
+            "position": self.position,
+            "points": self.points,
+            "status": self.status,
+            "driver": self.driver.as_dict(),
+            "constructor": self.constructor.as_dict(),
+        }
+
+    def as_ergast(self):
+        return {
+            "position": self.position,
+            "positionText": self.position_text,
+            "number": self.number,
+            "points": self.points,
+            "grid": self.grid,
+            "laps": self.laps,
+            "status": self.status,
+            "Driver": self.driver.as_ergast(),
+            "Constructor": self.constructor.as_ergast(),
+        }
+
+
+class QualifyingResult:
+    __slots__ = ("position", "number", "q1", "q2", "q3", "driver", "constructor")
+
+    def __init__(self, d):
+        self.position = d.get("position")
+        self.number = d.get("number")
+        self.q1 = d.get("Q1")
+        self.q2 = d.get("Q2")
+        self.q3 = d.get("Q3")
+        self.driver = Driver.from_data(d.get("Driver", {}))
+        self.constructor = Constructor.from_data(d.get("Constructor", {}))
+
+    def as_dict(self):
+        return {
+            "number": self.number,
+            "position": self.position,
+            "Q1": self.q1,
+            "Q2": self.q2,
+            "Q3": self.q3,
+            "driver": self.driver.as_dict(),
+            "constructor": self.constructor.as_dict(),
+        }
+
+    def as_ergast(self):
+        out = {"position": self.position, "number": self.number}
+        for key, value in (("Q1", self.q1), ("Q2", self.q2), ("Q3", self.q3)):
+            if value is not None:
+                out[key] = value
+        out["Driver"] = self.driver.as_ergast()
+        out["Constructor"] = self.constructor.as_ergast()
+        return out
+
+
+class Standing:
+    """A driver or constructor championship position; ``driver`` is None for constructors."""
+
+    __slots__ = ("position", "position_text", "points", "wins", "driver", "constructors")
+
+    def __init__(self, d):
+        self.position = d.get("position")
+        self.position_text = d.get("positionText")
+        self.points = d.get("points")
+        self.wins = d.get("wins")
+        driver = d.get("Driver")
+        self.driver = Driver.from_data(driver) if driver is not None else None
+        if "Constructor" in d:
+            self.constructors = (Constructor.from_data(d["Constructor"]),)
+        else:
+            self.constructors = tuple(Constructor.from_data(c) for c in d.get("Constructors", []))
+
+    def as_ergast(self):
+        out = {
+            "position": self.position,
+            "positionText": self.position_text,
+            "points": self.points,
+            "wins": self.wins,
+        }
+        if self.driver is not None:
+            out["Driver"] = self.driver.as_ergast()
+            out["Constructors"] = [c.as_ergast() for c in self.constructors]
+        else:
+            out["Constructor"] = self.constructors[0].as_ergast() if self.constructors else {}
+        return out
+
+
+class Session:
+    """A single session of a race weekend."""
+
+    __slots__ = ("start", "kind", "race")
+
+    def __init__(self, start, kind, race):
+        self.start = start
+        self.kind = kind
+        self.race = race
+
+    @property
+    def round(self):
+        return self.race.round
+
+    @property
+    def end(self):
+        return self.start + SESSION_DURATIONS[self.kind]
+
+    def __repr__(self):
+        return f"Session({self.kind!r}, {self.start.isoformat()}, round={self.round})"
+
+
+class Race:
+    __slots__ = (
+        "season", "round", "name", "url", "circuit", "sessions",
+        "results", "qualifying_results", "sprint_results",
+    )
+
+    def __init__(self, d):
+        self.season = d.get("season")
+        self.round = d.get("round")
+        self.name = d.get("raceName")
+        self.url = d.get("url")
+        self.circuit = Circuit.from_data(d.get("Circuit", {}))
+        sessions = []
+        for key, kind in SESSION_KEYS:
+            block = d.get(key)
+            start = parse_datetime(block.get("date"), block.get("time")) if block else None
+            if start is not None:
+                sessions.append(Session(start, kind, self))
+        start = parse_datetime(d.get("date"), d.get("time"))
+        if start is not None:
+            sessions.append(Session(start, RACE, self))
+        self.sessions = tuple(sessions)
+        self.results = tuple(Result(r) for r in d.get("Results", ()))
+        self.qualifying_results = tuple(QualifyingResult(r) for r in d.get("QualifyingResults", ()))
+        self.sprint_results = tuple(Result(r) for r in d.get("SprintResults", ()))
+
+    def session(self, kind):
+        return next((s for s in self.sessions if s.kind == kind), None)
+
+    @property
+    def start(self):
+        race = self.session(RACE)
+        return race.start if race else None
+
+    def winner(self, sprint=False):
+        results = self.sprint_results if sprint else self.results
+        return next((r for r in results if r.position_text == "1"), None)
+
+    def as_ergast(self, results=False):
+        """The schedule entry as the API returns it, with ``results`` also its result lists."""
+        out = {
+            "season": self.season,
+            "round": self.round,
+            "url": self.url,
+            "raceName": self.name,
+            "Circuit": self.circuit.as_ergast(),
+        }
+        race = self.session(RACE)
+        if race is not None:
+            out.update(_ergast_datetime(race.start))
+        for key, kind in SESSION_KEYS:
+            session = self.session(kind)
+            if session is not None:
+                out[key] = _ergast_datetime(session.start)
+        if results:
+            for key, rows in (
+                ("Results", self.results),
+                ("QualifyingResults", self.qualifying_results),
+                ("SprintResults", self.sprint_results),
+            ):
+                if rows:
+                    out[key] = [row.as_ergast() for row in rows]
+        return out
+
+
+class RaceTable:
+    __slots__ = ("season", "races")
+
+    def __init__(self, season, races):
+        self.season = season
+        self.races = races
+
+    @classmethod
+    def from_data(cls, table):
+        return cls(table.get("season"), tuple(Race(r) for r in table.get("Races", ())))
+
+    @classmethod
+    def from_payload(cls, data):
+        return cls.from_data((data or {}).get("MRData", {}).get("RaceTable", {}))
+
+    def as_payload(self):
+        races = [race.as_ergast(results=True) for race in self.races]
+        return {"MRData": {"RaceTable": {"season": self.season, "Races": races}}}
+
+
+class StandingsTable:
+    __slots__ = ("season", "round", "standings")
+
+    def __init__(self, season, round_, standings):
+        self.season = season
+        self.round = round_
+        self.standings = standings
+
+    @classmethod
+    def from_data(cls, table):
+        lists = table.get("StandingsLists", [])
+        if not lists:
+            return cls(table.get("season"), table.get("round"), ())
+        first = lists[0]
+        rows = first.get("DriverStandings") or first.get("ConstructorStandings") or ()
+        return cls(first.get("season"), first.get("round"), tuple(Standing(r) for r in rows))
+
+    @classmethod
+    def from_payload(cls, data):
+        return cls.from_data((data or {}).get("MRData", {}).get("StandingsTable", {}))
+
+    def as_payload(self):
+        table = {"season": self.season, "round": self.round, "StandingsLists": []}
+        if self.standings:
+            key = "DriverStandings" if self.standings[0].driver is not None else "ConstructorStandings"
+            table["StandingsLists"].append({
+                "season": self.season,
+                "round": self.round,
+                key: [standing.as_ergast() for standing in self.standings],
+            })
+        return {"MRData": {"StandingsTable": table}}
+
+    @property
+    def leader(self):
+        return self.standings[0] if self.standings else None
+
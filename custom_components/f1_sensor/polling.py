@@ -0,0 +1,42 @@
+"""Calendar-aware poll intervals for the Jolpica-F1 endpoints."""
+from .const import (
+    POLL_CATCH_UP_MAX,
+    POLL_CATCH_UP_WINDOW,
+    POLL_IDLE_MAX,
+    POLL_MIN_INTERVAL,
+)
+
+
+def _clamp(value, low, high):
+    return max(low, min(value, high))
+
+
+class AdaptivePolling:
+    """Picks the next poll of an endpoint from the sessions that feed it.
+
+    While the endpoint has not changed since the latest relevant session
+    ended it is polled often, backing off as time passes; otherwise it sleeps
+    until the next such session ends.
+    """
+
+    def __init__(self, race_coordinator, kinds):
+        self._race_coordinator = race_coordinator
+        self._kinds = tuple(kinds)
+
+    def next_interval(self, last_changed, now):
+        schedule = self._race_coordinator.schedule
+        if not schedule:
+            # The schedule has not loaded yet; check back soon.
+            return POLL_CATCH_UP_MAX
+        latest = schedule.latest_session(self._kinds, now)
+        if latest is not None:
+            if now < latest.end:
+                return max(latest.end - now, POLL_MIN_INTERVAL)
+            since = now - latest.end
+            if (last_changed is None or last_changed < latest.end) and since < POLL_CATCH_UP_WINDOW:
+                return _clamp(since / 4, POLL_MIN_INTERVAL, POLL_CATCH_UP_MAX)
+
+        upcoming = schedule.next_session(now, self._kinds)
+        if upcoming is None:
+            return POLL_IDLE_MAX
+        return _clamp(upcoming.end - now, POLL_MIN_INTERVAL, POLL_IDLE_MAX)
@@ -0,0 +1,104 @@
+"""Per-host request budgets shared by every coordinator and config entry."""
+import heapq
+import itertools
+import time
+
+
+class HostLimiter:
+    """Token buckets for one host, serving waiting requests by priority.
+
+    ``limits`` are ``(requests, seconds)`` budgets, such as 4 a second and
+    500 an hour; every request spends a token from each. Waiting requests
+    are served lowest priority first, then in arrival order, and nothing is
+    served while the host has asked us to back off.
+    """
+
+    def __init__(self, loop, limits):
+        self._loop = loop
+        # [tokens, capacity, tokens per second]
+        self._buckets = [[float(requests), requests, requests / seconds] for requests, seconds in limits]
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._queue = []
+        self._order = itertools.count()
+        self._timer = None
+        self.requests = 0
+        self.backoffs = 0
+        self.max_queue_depth = 0
+        self.wait_time_total = 0.0
+
+    @property
+    def queue_depth(self):
+        return sum(1 for _, _, future in self._queue if not future.done())
+
+    async def acquire(self, priority):
+        """Wait for a token; returns the seconds spent waiting."""
+        self._refill()
+        if not self._queue and self._available():
+            self._take()
+            return 0.0
+        started = time.monotonic()
+        future = self._loop.create_future()
+        heapq.heappush(self._queue, (priority, next(self._order), future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        self._schedule()
+        await future
+        waited = time.monotonic() - started
+        self.wait_time_total += waited
+        return waited
+
+    def backoff(self, seconds):
+        """Hold every request to the host for ``seconds``, as its Retry-After asked."""
+        self.backoffs += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._schedule()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        for bucket in self._buckets:
+            bucket[0] = min(bucket[1], bucket[0] + elapsed * bucket[2])
+
+    def _available(self):
+        return time.monotonic() >= self._blocked_until and all(tokens >= 1 for tokens, _, _ in self._buckets)
+
+    def _take(self):
+        self.requests += 1
+        for bucket in self._buckets:
+            bucket[0] -= 1
+
+    def _schedule(self):
+        if self._timer is not None or not self._queue:
+            return
+        now = time.monotonic()
+        delay = max(
+            self._blocked_until - now,
+            *((1 - tokens) / rate for tokens, _, rate in self._buckets),
+        )
+        self._timer = self._loop.call_later(max(delay, 0), self._dispatch)
+
+    def _dispatch(self):
+        self._timer = None
+        self._refill()
+        while self._queue and (self._queue[0][2].done() or self._available()):
+            _, _, future = heapq.heappop(self._queue)
+            # Requests cancelled while waiting give up their place.
+            if not future.done():
+                self._take()
+                future.set_result(None)
+        self._schedule()
+
+    def as_dict(self):
+        self._refill()
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "backoffs": self.backoffs,
+            "wait_total_s": round(self.wait_time_total, 1),
+            "blocked_for_s": round(max(self._blocked_until - time.monotonic(), 0), 1),
+            "tokens": [round(tokens, 1) for tokens, _, _ in self._buckets],
+        }
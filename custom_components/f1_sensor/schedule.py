@@ -0,0 +1,110 @@
+"""Sorted, bisectable index over the season schedule."""
+from bisect import bisect_left, bisect_right
+import datetime
+
+from .model import RACE, SESSION_DURATIONS, RaceTable
+
+# Sessions starting this long before a range can still overlap it.
+_LONGEST_SESSION = max(SESSION_DURATIONS.values())
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class ScheduleIndex:
+    """Race and session start times parsed once and kept sorted.
+
+    Built from the parsed ``current.json`` schedule on every change of the
+    race coordinator; lookups are binary searches over the sorted start times.
+    """
+
+    __slots__ = (
+        "season", "races", "_races", "_race_starts", "_sessions", "_session_starts", "_session_ends", "_by_round"
+    )
+
+    def __init__(self, season, races, sessions):
+        self.season = season
+        self.races = races
+        self._races = sorted((s for s in sessions if s.kind == RACE), key=lambda s: s.start)
+        self._race_starts = [s.start for s in self._races]
+        self._sessions = sorted(sessions, key=lambda s: s.start)
+        self._session_starts = [s.start for s in self._sessions]
+        self._session_ends = sorted(s.end for s in self._sessions)
+        self._by_round = {}
+        for session in self._sessions:
+            self._by_round.setdefault(session.round, {})[session.kind] = session.start
+
+    @classmethod
+    def from_table(cls, table):
+        sessions = [session for race in table.races for session in race.sessions]
+        return cls(table.season, table.races, sessions)
+
+    @classmethod
+    def from_data(cls, data):
+        return cls.from_table(RaceTable.from_payload(data))
+
+    def __len__(self):
+        return len(self.races)
+
+    def next_race(self, now=None):
+        """Return the first race session starting after ``now``."""
+        i = bisect_right(self._race_starts, now or _utcnow())
+        return self._races[i] if i < len(self._races) else None
+
+    def last_race(self, now=None):
+        """Return the most recent race session that started at or before ``now``."""
+        i = bisect_right(self._race_starts, now or _utcnow())
+        return self._races[i - 1] if i else None
+
+    def next_session(self, now=None, kinds=None):
+        """Return the first session starting after ``now``, optionally of ``kinds``."""
+        i = bisect_right(self._session_starts, now or _utcnow())
+        for j in range(i, len(self._sessions)):
+            session = self._sessions[j]
+            if kinds is None or session.kind in kinds:
+                return session
+        return None
+
+    def latest_session(self, kinds=None, now=None):
+        """Return the last session that started at or before ``now``, optionally of ``kinds``."""
+        i = bisect_right(self._session_starts, now or _utcnow())
+        for j in range(i - 1, -1, -1):
+            session = self._sessions[j]
+            if kinds is None or session.kind in kinds:
+                return session
+        return None
+
+    def current_session(self, now=None):
+        """Return the session running at ``now``, if any."""
+        now = now or _utcnow()
+        i = bisect_right(self._session_starts, now)
+        # Sessions never overlap, so only the latest one to start can be running.
+        if i and now < self._sessions[i - 1].end:
+            return self._sessions[i - 1]
+        return None
+
+    def next_session_end(self, now=None):
+        """Return the first session end after ``now``."""
+        i = bisect_right(self._session_ends, now or _utcnow())
+        return self._session_ends[i] if i < len(self._session_ends) else None
+
+    def past_sessions(self, kind, now=None):
+        """Return every ``kind`` session that started at or before ``now``."""
+        i = bisect_right(self._session_starts, now or _utcnow())
+        return [session for session in self._sessions[:i] if session.kind == kind]
+
+    def sessions_overlapping(self, start, end):
+        """Return all sessions running at some point in ``[start, end)``."""
+        lo = bisect_left(self._session_starts, start - _LONGEST_SESSION)
+        hi = bisect_left(self._session_starts, end, lo)
+        return [session for session in self._sessions[lo:hi] if session.end > start]
+
+    def latest_round(self, kind, now=None):
+        """Return the highest round whose ``kind`` session started at or before ``now``."""
+        session = self.latest_session((kind,), now)
+        return int(session.round) if session else None
+
+    def session_starts(self, round_):
+        """Return ``{kind: start}`` for every session of the given round."""
+        return self._by_round.get(str(round_), {})
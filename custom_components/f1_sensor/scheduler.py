@@ -0,0 +1,89 @@
+"""Point-in-time wake-ups at the boundaries of the season schedule."""
+import datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+# Moments at which time-dependent entities change.
+BOUNDARY_SESSION_START = "session_start"
+BOUNDARY_SESSION_END = "session_end"
+BOUNDARY_RACE_START = "race_start"
+BOUNDARY_DAY = "day"
+
+
+class SessionScheduler:
+    """Wakes listeners at the schedule boundaries they track, and at no other time.
+
+    A single timer is armed for the earliest boundary any listener waits
+    for. It is rearmed after it fires, when listeners come and go, and when
+    the race coordinator publishes a new schedule. Days start at midnight
+    UTC, like the race week sensor's calendar.
+    """
+
+    def __init__(self, hass: HomeAssistant, race_coordinator):
+        self.hass = hass
+        self._race_coordinator = race_coordinator
+        # token -> (action, boundaries)
+        self._listeners = {}
+        # boundary -> when, for the armed timer
+        self._due = {}
+        self._unsub = None
+
+    @callback
+    def async_track(self, action, boundaries):
+        """Call ``action(now)`` at every ``boundaries`` moment; returns a remove callback."""
+        token = object()
+        self._listeners[token] = (action, frozenset(boundaries))
+        self.async_rearm()
+
+        @callback
+        def _remove():
+            if self._listeners.pop(token, None) is not None:
+                self.async_rearm()
+
+        return _remove
+
+    def next_boundary(self, boundary, now):
+        schedule = self._race_coordinator.schedule
+        if boundary == BOUNDARY_SESSION_START:
+            session = schedule.next_session(now)
+            return session.start if session else None
+        if boundary == BOUNDARY_SESSION_END:
+            return schedule.next_session_end(now)
+        if boundary == BOUNDARY_RACE_START:
+            race = schedule.next_race(now)
+            return race.start if race else None
+        return datetime.datetime.combine(
+            now.date() + datetime.timedelta(days=1), datetime.time(), datetime.timezone.utc
+        )
+
+    @callback
+    def async_rearm(self):
+        self.async_cancel()
+        now = dt_util.utcnow()
+        boundaries = set()
+        for _, tracked in self._listeners.values():
+            boundaries |= tracked
+        self._due = {}
+        for boundary in boundaries:
+            when = self.next_boundary(boundary, now)
+            if when is not None:
+                self._due[boundary] = when
+        if self._due:
+            self._unsub = async_track_point_in_utc_time(self.hass, self._async_fire, min(self._due.values()))
+
+    @callback
+    def async_cancel(self):
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_fire(self, now):
+        self._unsub = None
+        due = {boundary for boundary, when in self._due.items() if when <= now}
+        for action, tracked in list(self._listeners.values()):
+            if tracked & due:
+                action(now)
+        self.async_rearm()
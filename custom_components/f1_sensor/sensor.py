@@ -1,14 +1,29 @@
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-import async_timeout
+from homeassistant.util import dt as dt_util
 import datetime
 
 
-from .const import DOMAIN
+from .const import DOMAIN, LIVE_MESSAGES_KEPT, SENSOR_ENDPOINTS, SIGNAL_SENSORS_CHANGED
+from .coordinator import async_release_coordinator
+from .datasets import (
+    HEAVY_ATTRIBUTES,
+    constructor_standings,
+    current_season,
+    driver_standings,
+    last_qualifying_results,
+    last_race_results,
+    season_results,
+)
+from .entity import F1CoordinatorEntity
+from .model import SESSION_DURATIONS
+from .scheduler import BOUNDARY_DAY, BOUNDARY_RACE_START, BOUNDARY_SESSION_END, BOUNDARY_SESSION_START
+from .weather import async_acquire_weather, location_key
 
 
 SYMBOL_CODE_TO_MDI = {
@@ -55,32 +70,48 @@ SYMBOL_CODE_TO_MDI = {
 }
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    """Create sensors when integration is added."""
+    """Create sensors when integration is added and follow reconfiguration."""
     data = hass.data[DOMAIN][entry.entry_id]
     base = entry.data.get("sensor_name", "F1")
-    enabled = entry.data.get("enabled_sensors", [])
-
-    mapping = {
-        "next_race": (F1NextRaceSensor, data["race_coordinator"]),
-        "current_season": (F1CurrentSeasonSensor, data["race_coordinator"]),
-        "driver_standings": (F1DriverStandingsSensor, data["driver_coordinator"]),
-        "constructor_standings": (F1ConstructorStandingsSensor, data["constructor_coordinator"]),
-        "weather": (F1WeatherSensor, data["race_coordinator"]),
-        "last_race_results": (F1LastRaceSensor, data["last_race_coordinator"]),
-        "last_qualifying_results": (F1LastQualifyingSensor, data["last_qualifying_coordinator"]),
-        "season_results": (F1SeasonResultsSensor, data["season_results_coordinator"]),
-        "race_week": (F1RaceWeekSensor, data["race_coordinator"]),
-    }
+    compact = entry.data.get("compact_attributes", False)
+    entities = data["entities"] = {}
+    # Endpoint -> its diagnostic sensor, while diagnostic sensors are enabled.
+    diagnostics = {}
+
+    @callback
+    def _async_sync_entities():
+        enabled = entry.data.get("enabled_sensors", [])
+        for key in [key for key in entities if key not in enabled]:
+            hass.async_create_task(entities.pop(key).async_remove())
+
+        sensors = []
+        for key in enabled:
+            cls = SENSOR_TYPES.get(key)
+            coord = data["coordinators"].get(SENSOR_ENDPOINTS[key][-1]) if cls else None
+            if coord and key not in entities:
+                entities[key] = cls(coord, f"{base}_{key}")
+                entities[key].compact = compact
+                sensors.append(entities[key])
+
+        endpoints = data["coordinators"] if entry.data.get("diagnostic_sensors", False) else {}
+        for endpoint in [endpoint for endpoint in diagnostics if endpoint not in endpoints]:
+            hass.async_create_task(diagnostics.pop(endpoint).async_remove())
+        for endpoint, coord in endpoints.items():
+            if endpoint not in diagnostics:
+                diagnostics[endpoint] = F1EndpointDiagnosticSensor(
+                    coord, f"{base}_{endpoint}_endpoint", entities
+                )
+                sensors.append(diagnostics[endpoint])
+        if sensors:
+            async_add_entities(sensors)
 
-    sensors = []
-    for key in enabled:
-        cls, coord = mapping.get(key, (None, None))
-        if cls and coord:
-            sensors.append(cls(coord, f"{base}_{key}"))
-    async_add_entities(sensors, True)
+    _async_sync_entities()
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_SENSORS_CHANGED.format(entry.entry_id), _async_sync_entities)
+    )
 
 
-class F1NextRaceSensor(CoordinatorEntity, SensorEntity):
+class F1NextRaceSensor(F1CoordinatorEntity, SensorEntity):
     """Sensor that returns date/time (ISO8601) for the next race in 'state'."""
 
     def __init__(self, coordinator, sensor_name):
@@ -90,86 +121,62 @@ class F1NextRaceSensor(CoordinatorEntity, SensorEntity):
         self._attr_icon = "mdi:flag-checkered"
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
 
+    _boundaries = (BOUNDARY_RACE_START,)
+
     def _get_next_race(self):
-        data = self.coordinator.data
-        if not data:
-            return None
+        return self.coordinator.schedule.next_race()
 
-        races = data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-        now = datetime.datetime.now(datetime.timezone.utc)
+    def _section_key(self):
+        next_race = self._get_next_race()
+        return f"next_race:{next_race.round if next_race else None}"
 
-        for race in races:
-            date = race.get("date")
-            time = race.get("time") or "00:00:00Z"
-            dt_str = f"{date}T{time}".replace("Z", "+00:00")
-            try:
-                dt = datetime.datetime.fromisoformat(dt_str)
-            except ValueError:
-                continue
-            if dt > now:
-                return race
-        return None
-
-    def combine_date_time(self, date_str, time_str):
-        if not date_str:
-            return None
-        if not time_str:
-            time_str = "00:00:00Z"
-        dt_str = f"{date_str}T{time_str}".replace("Z", "+00:00")
-        try:
-            dt = datetime.datetime.fromisoformat(dt_str)
-            return dt.isoformat()
-        except ValueError:
-            return None
+    def _section(self, data):
+        next_race = self._get_next_race()
+        return next_race.race.as_ergast() if next_race else None
 
-    @property
-    def state(self):
+    def _compute_state(self):
         next_race = self._get_next_race()
         if not next_race:
             return None
-        return self.combine_date_time(next_race.get("date"), next_race.get("time"))
+        return next_race.start.isoformat()
 
-    @property
-    def extra_state_attributes(self):
-        race = self._get_next_race()
-        if not race:
+    def _compute_attributes(self):
+        next_race = self._get_next_race()
+        if not next_race:
             return {}
+        race = next_race.race
+        circuit = race.circuit
+        starts = self.coordinator.schedule.session_starts(next_race.round)
 
-        circuit = race.get("Circuit", {})
-        loc = circuit.get("Location", {})
-
-        first_practice = race.get("FirstPractice", {})
-        second_practice = race.get("SecondPractice", {})
-        third_practice = race.get("ThirdPractice", {})
-        qualifying = race.get("Qualifying", {})
-        sprint_qualifying = race.get("SprintQualifying", {})
-        sprint = race.get("Sprint", {})
+        def _iso(kind):
+            dt = starts.get(kind)
+            return dt.isoformat() if dt else None
 
         return {
-            "season": race.get("season"),
-            "round": race.get("round"),
-            "race_name": race.get("raceName"),
-            "race_url": race.get("url"),
-
-            "circuit_id": circuit.get("circuitId"),
-            "circuit_name": circuit.get("circuitName"),
-            "circuit_url": circuit.get("url"),
-            "circuit_lat": loc.get("lat"),
-            "circuit_long": loc.get("long"),
-            "circuit_locality": loc.get("locality"),
-            "circuit_country": loc.get("country"),
-
-            "race_start": self.combine_date_time(race.get("date"), race.get("time")),
-            "first_practice_start": self.combine_date_time(first_practice.get("date"), first_practice.get("time")),
-            "second_practice_start": self.combine_date_time(second_practice.get("date"), second_practice.get("time")),
-            "third_practice_start": self.combine_date_time(third_practice.get("date"), third_practice.get("time")),
-            "qualifying_start": self.combine_date_time(qualifying.get("date"), qualifying.get("time")),
-            "sprint_qualifying_start": self.combine_date_time(sprint_qualifying.get("date"), sprint_qualifying.get("time")),
-            "sprint_start": self.combine_date_time(sprint.get("date"), sprint.get("time")),
+            "season": race.season,
+            "round": race.round,
+            "race_name": race.name,
+            "race_url": race.url,
+
+            "circuit_id": circuit.circuit_id,
+            "circuit_name": circuit.name,
+            "circuit_url": circuit.url,
+            "circuit_lat": circuit.lat,
+            "circuit_long": circuit.long,
+            "circuit_locality": circuit.locality,
+            "circuit_country": circuit.country,
+
+            "race_start": next_race.start.isoformat(),
+            "first_practice_start": _iso("first_practice"),
+            "second_practice_start": _iso("second_practice"),
+            "third_practice_start": _iso("third_practice"),
+            "qualifying_start": _iso("qualifying"),
+            "sprint_qualifying_start": _iso("sprint_qualifying"),
+            "sprint_start": _iso("sprint"),
         }
 
 
-class F1CurrentSeasonSensor(CoordinatorEntity, SensorEntity):
+class F1CurrentSeasonSensor(F1CoordinatorEntity, SensorEntity):
     """Sensor showing number of races this season."""
 
     def __init__(self, coordinator, sensor_name):
@@ -178,22 +185,51 @@ class F1CurrentSeasonSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{sensor_name}_unique"
         self._attr_icon = "mdi:calendar-month"
 
-    @property
-    def state(self):
-        data = self.coordinator.data or {}
-        races = data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-        return len(races)
+    def _section_key(self):
+        if not self.compact:
+            return None
+        next_race = self.coordinator.schedule.next_race()
+        return f"current_season:{next_race.round if next_race else None}"
+
+    def _section(self, data):
+        # The compact output is small enough to be its own section, so every
+        # input it reads (the race count included) is covered.
+        return [self._compute_state(), self._compute_attributes()]
 
     @property
-    def extra_state_attributes(self):
-        table = (self.coordinator.data or {}).get("MRData", {}).get("RaceTable", {})
+    def _boundaries(self):
+        # The compact summary names the last and next round.
+        return (BOUNDARY_RACE_START,) if self.compact else ()
+
+    def _compute_state(self):
+        return len(self.coordinator.model.races)
+
+    def _compute_attributes(self):
+        if not self.compact:
+            return current_season(self.coordinator.model)
+        schedule = self.coordinator.schedule
+        last_race = schedule.last_race()
+        next_race = schedule.next_race()
         return {
-            "season": table.get("season"),
-            "races": table.get("Races", [])
+            "season": schedule.season,
+            "last_round": last_race.round if last_race else None,
+            "next_round": next_race.round if next_race else None,
         }
 
 
-class F1DriverStandingsSensor(CoordinatorEntity, SensorEntity):
+def _standings_summary(table, name):
+    leader = table.leader
+    if leader is None:
+        return {}
+    return {
+        "season": table.season,
+        "round": table.round,
+        "leader": name(leader),
+        "leader_points": leader.points,
+    }
+
+
+class F1DriverStandingsSensor(F1CoordinatorEntity, SensorEntity):
     """Sensor for driver standings."""
 
     def __init__(self, coordinator, sensor_name):
@@ -202,25 +238,16 @@ class F1DriverStandingsSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{sensor_name}_unique"
         self._attr_icon = "mdi:account-multiple-check"
 
-    @property
-    def state(self):
-        lists = (self.coordinator.data or {}).get("MRData", {}).get("StandingsTable", {}).get("StandingsLists", [])
-        return len(lists[0].get("DriverStandings", [])) if lists else 0
+    def _compute_state(self):
+        return len(self.coordinator.model.standings)
 
-    @property
-    def extra_state_attributes(self):
-        lists = (self.coordinator.data or {}).get("MRData", {}).get("StandingsTable", {}).get("StandingsLists", [])
-        if not lists:
-            return {}
-        first = lists[0]
-        return {
-            "season": first.get("season"),
-            "round": first.get("round"),
-            "driver_standings": first.get("DriverStandings", [])
-        }
+    def _compute_attributes(self):
+        if not self.compact:
+            return driver_standings(self.coordinator.model)
+        return _standings_summary(self.coordinator.model, lambda s: s.driver.family_name)
 
 
-class F1ConstructorStandingsSensor(CoordinatorEntity, SensorEntity):
+class F1ConstructorStandingsSensor(F1CoordinatorEntity, SensorEntity):
     """Sensor for constructor standings."""
 
     def __init__(self, coordinator, sensor_name):
@@ -229,26 +256,17 @@ class F1ConstructorStandingsSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{sensor_name}_unique"
         self._attr_icon = "mdi:factory"
 
-    @property
-    def state(self):
-        lists = (self.coordinator.data or {}).get("MRData", {}).get("StandingsTable", {}).get("StandingsLists", [])
-        return len(lists[0].get("ConstructorStandings", [])) if lists else 0
+    def _compute_state(self):
+        return len(self.coordinator.model.standings)
 
-    @property
-    def extra_state_attributes(self):
-        lists = (self.coordinator.data or {}).get("MRData", {}).get("StandingsTable", {}).get("StandingsLists", [])
-        if not lists:
-            return {}
-        first = lists[0]
-        return {
-            "season": first.get("season"),
-            "round": first.get("round"),
-            "constructor_standings": first.get("ConstructorStandings", [])
-        }
+    def _compute_attributes(self):
+        if not self.compact:
+            return constructor_standings(self.coordinator.model)
+        return _standings_summary(self.coordinator.model, lambda s: s.constructors[0].name)
 
 
-class F1WeatherSensor(CoordinatorEntity, SensorEntity):
-    """Sensor for current and race-start weather."""
+class F1WeatherSensor(F1CoordinatorEntity, SensorEntity):
+    """Sensor for current weather and the forecast for each session of the next race weekend."""
 
     def __init__(self, coordinator, sensor_name):
         super().__init__(coordinator)
@@ -256,64 +274,96 @@ class F1WeatherSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{sensor_name}_unique"
         self._attr_icon = "mdi:weather-partly-cloudy"
         self._current = {}
-        self._race = {}
+        self._sessions = {}
+        self._weather = None
+        self._weather_unsub = None
+
+    # The forecast follows the next race's circuit.
+    _boundaries = (BOUNDARY_RACE_START,)
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        removal = self.coordinator.async_add_listener(lambda: self.hass.async_create_task(self._update_weather()))
-        self.async_on_remove(removal)
-        await self._update_weather()
-
-    async def _update_weather(self):
-        race = F1NextRaceSensor(self.coordinator, "")._get_next_race()
-        loc = race.get("Circuit", {}).get("Location", {}) if race else {}
-        lat, lon = loc.get("lat"), loc.get("long")
-        if lat is None or lon is None:
+        self.async_on_remove(self._release_weather)
+        await self._async_follow_circuit()
+
+    @callback
+    def _async_boundary(self, now):
+        self.hass.async_create_task(self._async_follow_circuit())
+
+    def _update_token(self):
+        next_race = self.coordinator.schedule.next_race()
+        version = self._weather.data_version if self._weather else None
+        return version, next_race.round if next_race else None
+
+    @callback
+    def _handle_coordinator_update(self):
+        self.hass.async_create_task(self._async_follow_circuit())
+
+    def _release_weather(self):
+        if self._weather is None:
             return
-        session = async_get_clientsession(self.hass)
-        url = f"https://api.met.no/weatherapi/locationforecast/2.0/compact?lat={lat}&lon={lon}"
-        headers = {"User-Agent": "homeassistant-f1_sensor"}
-        try:
-            async with async_timeout.timeout(10):
-                resp = await session.get(url, headers=headers)
-                data = await resp.json()
-        except Exception:
+        self._weather_unsub()
+        async_release_coordinator(self.hass, self._weather)
+        self._weather = None
+
+    async def _async_follow_circuit(self):
+        """Switch to the forecast of the next race's circuit when it changes."""
+        next_race = self.coordinator.schedule.next_race()
+        circuit = next_race.race.circuit if next_race else None
+        location = location_key(circuit.lat, circuit.long) if circuit else None
+        if self._weather is not None and self._weather.location == location:
+            self._update_weather()
             return
-        times = data.get("properties", {}).get("timeseries", [])
-        if not times:
+        self._release_weather()
+        if location is None:
             return
-        curr = times[0].get("data", {}).get("instant", {}).get("details", {})
-        self._current = self._extract(curr)
-        current_symbol = times[0] \
-            .get("data", {}) \
-            .get("next_1_hours", {}) \
-            .get("summary", {}) \
-            .get("symbol_code")
-        current_icon = SYMBOL_CODE_TO_MDI.get(current_symbol, self._attr_icon)
-        self._attr_icon = current_icon
-        start_iso = F1NextRaceSensor(self.coordinator, "").combine_date_time(race.get("date"), race.get("time")) if race else None
-        self._race = {k: None for k in self._current}
-        if start_iso:
-            start_dt = datetime.datetime.fromisoformat(start_iso)
-            same_day = [t for t in times if datetime.datetime.fromisoformat(t["time"]).date() == start_dt.date()]
-            if same_day:
-                closest = min(same_day, key=lambda t: abs(datetime.datetime.fromisoformat(t["time"]) - start_dt))
-                data_entry = closest.get("data", {})
-                instant_details = data_entry.get("instant", {}).get("details", {})
-                precip_1h = data_entry.get("next_1_hours", {}).get("details", {}).get("precipitation_amount", 0)
-                rd = dict(instant_details)
-                rd["precipitation_amount"] = precip_1h
-                self._race = self._extract(rd)
-                forecast_block = (
-                    data_entry.get("next_1_hours")
-                    or data_entry.get("next_6_hours")
-                    or data_entry.get("next_12_hours", {})
-                )
-                race_symbol = forecast_block.get("summary", {}).get("symbol_code")
-                race_icon = SYMBOL_CODE_TO_MDI.get(race_symbol, self._attr_icon)
-                self._race["weather_icon"] = race_icon
+        weather = self._weather = async_acquire_weather(self.hass, location)
+        self._weather_unsub = weather.async_add_listener(self._update_weather)
+        await weather.async_start()
+        if self._weather is weather:
+            self._update_weather()
+
+    @callback
+    def _update_weather(self):
+        forecast = self._weather.forecast if self._weather else None
+        if not forecast:
+            return
+        token = self._update_token()
+        if token == self._written:
+            self._weather.stats.skipped_writes += 1
+            return
+        self._written = token
+        curr = forecast.current().get("data", {})
+        self._current = self._extract(curr.get("instant", {}).get("details", {}))
+        current_symbol = curr.get("next_1_hours", {}).get("summary", {}).get("symbol_code")
+        self._attr_icon = SYMBOL_CODE_TO_MDI.get(current_symbol, self._attr_icon)
+
+        self._sessions = {}
+        next_race = self.coordinator.schedule.next_race()
+        if next_race:
+            starts = self.coordinator.schedule.session_starts(next_race.round)
+            for kind, start in starts.items():
+                self._sessions[kind] = self._session_weather(forecast.nearest_same_day(start))
         self.async_write_ha_state()
 
+    def _session_weather(self, entry):
+        if entry is None:
+            return {k: None for k in self._current}
+        data_entry = entry.get("data", {})
+        instant_details = data_entry.get("instant", {}).get("details", {})
+        precip_1h = data_entry.get("next_1_hours", {}).get("details", {}).get("precipitation_amount", 0)
+        rd = dict(instant_details)
+        rd["precipitation_amount"] = precip_1h
+        weather = self._extract(rd)
+        forecast_block = (
+            data_entry.get("next_1_hours")
+            or data_entry.get("next_6_hours")
+            or data_entry.get("next_12_hours", {})
+        )
+        symbol = forecast_block.get("summary", {}).get("symbol_code")
+        weather["weather_icon"] = SYMBOL_CODE_TO_MDI.get(symbol, self._attr_icon)
+        return weather
+
     def _extract(self, d):
         wd = d.get("wind_from_direction")
         return {
@@ -348,11 +398,23 @@ class F1WeatherSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self):
         attrs = {f"current_{k}": v for k, v in self._current.items()}
-        attrs.update({f"race_{k}": v for k, v in self._race.items()})
+        race = self._sessions.get("race", dict.fromkeys(self._current))
+        attrs.update({f"race_{k}": v for k, v in race.items()})
+        for kind, weather in self._sessions.items():
+            if kind != "race":
+                attrs.update({f"{kind}_{k}": v for k, v in weather.items()})
         return attrs
 
 
-class F1LastRaceSensor(CoordinatorEntity, SensorEntity):
+def _results_summary(race, results, key):
+    return {
+        "round": race.round,
+        "race_name": race.name,
+        key: [r.driver.code for r in results[:3]],
+    }
+
+
+class F1LastRaceSensor(F1CoordinatorEntity, SensorEntity):
     """Sensor for results of the latest race."""
 
     def __init__(self, coordinator, sensor_name):
@@ -361,49 +423,19 @@ class F1LastRaceSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{sensor_name}_unique"
         self._attr_icon = "mdi:trophy"
 
-    @property
-    def state(self):
-        races = self.coordinator.data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-        if not races:
-            return None
-        results = races[0].get("Results", [])
-        winner = next((r for r in results if r.get("positionText") == "1"), None)
-        return winner.get("Driver", {}).get("familyName") if winner else None
+    def _compute_state(self):
+        races = self.coordinator.model.races
+        winner = races[0].winner() if races else None
+        return winner.driver.family_name if winner else None
 
-    @property
-    def extra_state_attributes(self):
-        races = self.coordinator.data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-        if not races:
-            return {}
-        race = races[0]
-
-        def _clean_result(r):
-            return {
-                "number": r.get("number"),
-                "position": r.get("position"),
-                "points": r.get("points"),
-                "status": r.get("status"),
-                "driver": {
-                    "permanentNumber": r.get("Driver", {}).get("permanentNumber"),
-                    "code": r.get("Driver", {}).get("code"),
-                    "givenName": r.get("Driver", {}).get("givenName"),
-                    "familyName": r.get("Driver", {}).get("familyName"),
-                },
-                "constructor": {
-                    "constructorId": r.get("Constructor", {}).get("constructorId"),
-                    "name": r.get("Constructor", {}).get("name"),
-                }
-            }
-
-        results = [_clean_result(r) for r in race.get("Results", [])]
-        return {
-            "round": race.get("round"),
-            "race_name": race.get("raceName"),
-            "results": results
-        }
+    def _compute_attributes(self):
+        if not self.compact:
+            return last_race_results(self.coordinator.model)
+        races = self.coordinator.model.races
+        return _results_summary(races[0], races[0].results, "podium") if races else {}
 
 
-class F1LastQualifyingSensor(CoordinatorEntity, SensorEntity):
+class F1LastQualifyingSensor(F1CoordinatorEntity, SensorEntity):
     """Sensor for results of the latest F1 qualifying."""
 
     def __init__(self, coordinator, sensor_name):
@@ -412,105 +444,65 @@ class F1LastQualifyingSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{sensor_name}_unique"
         self._attr_icon = "mdi:trophy"
 
-    @property
-    def state(self):
+    def _compute_state(self):
         """Return the winner's family name from qualifying."""
-        races = self.coordinator.data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
+        races = self.coordinator.model.races
         if not races:
             return None
-        race = races[0]
-        results = race.get("QualifyingResults", [])
 
         # Zoek degene met positie "1"
-        winner = next((r for r in results if r.get("position") == "1"), None)
-        return winner.get("Driver", {}).get("familyName") if winner else None
+        winner = next((r for r in races[0].qualifying_results if r.position == "1"), None)
+        return winner.driver.family_name if winner else None
 
-    @property
-    def extra_state_attributes(self):
-        """Return detailed qualifying results."""
-        races = self.coordinator.data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-        if not races:
-            return {}
-        race = races[0]
-        results_raw = race.get("QualifyingResults", [])
-
-        def _clean_result(r):
-            return {
-                "number": r.get("number"),
-                "position": r.get("position"),
-                "Q1": r.get("Q1"),
-                "Q2": r.get("Q2"),
-                "Q3": r.get("Q3"),
-                "driver": {
-                    "permanentNumber": r.get("Driver", {}).get("permanentNumber"),
-                    "code": r.get("Driver", {}).get("code"),
-                    "givenName": r.get("Driver", {}).get("givenName"),
-                    "familyName": r.get("Driver", {}).get("familyName"),
-                },
-                "constructor": {
-                    "constructorId": r.get("Constructor", {}).get("constructorId"),
-                    "name": r.get("Constructor", {}).get("name"),
-                }
-            }
-
-        QualifyingResults = [_clean_result(r) for r in results_raw]
-        return {
-            "round": race.get("round"),
-            "race_name": race.get("raceName"),
-            "results": QualifyingResults,
-        }
+    def _compute_attributes(self):
+        """Return detailed qualifying results, or the top three in compact mode."""
+        if not self.compact:
+            return last_qualifying_results(self.coordinator.model)
+        races = self.coordinator.model.races
+        return _results_summary(races[0], races[0].qualifying_results, "top_three") if races else {}
 
 
-class F1SeasonResultsSensor(CoordinatorEntity, SensorEntity):
+class F1SeasonResultsSensor(F1CoordinatorEntity, SensorEntity):
     """Sensor for entire season's results."""
 
+    _sprint = False
+
     def __init__(self, coordinator, sensor_name):
         super().__init__(coordinator)
         self._attr_name = sensor_name
         self._attr_unique_id = f"{sensor_name}_unique"
         self._attr_icon = "mdi:podium"
 
-    @property
-    def state(self):
-        races = self.coordinator.data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-        return len(races)
+    def _compute_state(self):
+        return len(self.coordinator.model.races)
 
-    @property
-    def extra_state_attributes(self):
-        races = self.coordinator.data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-
-        def _clean_result(r):
-            return {
-                "number": r.get("number"),
-                "position": r.get("position"),
-                "points": r.get("points"),
-                "status": r.get("status"),
-                "driver": {
-                    "permanentNumber": r.get("Driver", {}).get("permanentNumber"),
-                    "code": r.get("Driver", {}).get("code"),
-                    "givenName": r.get("Driver", {}).get("givenName"),
-                    "familyName": r.get("Driver", {}).get("familyName"),
-                },
-                "constructor": {
-                    "constructorId": r.get("Constructor", {}).get("constructorId"),
-                    "name": r.get("Constructor", {}).get("name"),
-                }
-            }
-
-        cleaned = []
-        for race in races:
-            results = [_clean_result(r) for r in race.get("Results", [])]
-            cleaned.append({
-                "round": race.get("round"),
-                "race_name": race.get("raceName"),
-                "results": results
-            })
-        return {"races": cleaned}
-
-
-class F1RaceWeekSensor(CoordinatorEntity, BinarySensorEntity):
+    def _compute_attributes(self):
+        if not self.compact:
+            return season_results(self.coordinator.model, self._sprint)
+        races = self.coordinator.model.races
+        if not races:
+            return {}
+        last = races[-1]
+        winner = last.winner(self._sprint)
+        return {
+            "last_round": last.round,
+            "last_race_name": last.name,
+            "last_winner": winner.driver.family_name if winner else None,
+        }
+
+
+class F1SprintResultsSensor(F1SeasonResultsSensor):
+    """Sensor for every sprint result of the season."""
+
+    _sprint = True
+
+
+class F1RaceWeekSensor(F1CoordinatorEntity, BinarySensorEntity):
     """Binary sensor that returns True if it's race week, else False. Extra attribute: days until next race."""
 
+    # Days until the race and the current week change at UTC midnight.
+    _boundaries = (BOUNDARY_RACE_START, BOUNDARY_DAY)
+
     def __init__(self, coordinator, sensor_name):
         super().__init__(coordinator)
         self._attr_name = sensor_name
@@ -519,27 +511,26 @@ class F1RaceWeekSensor(CoordinatorEntity, BinarySensorEntity):
         self._attr_device_class = BinarySensorDeviceClass.OCCUPANCY
 
     def _get_next_race(self):
-        data = self.coordinator.data
-        if not data:
+        next_race = self.coordinator.schedule.next_race()
+        if not next_race:
             return None, None
+        return next_race.start, next_race.race
 
-        races = data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-        now = datetime.datetime.now(datetime.timezone.utc)
+    def _section_key(self):
+        next_race = self.coordinator.schedule.next_race()
+        today = dt_util.utcnow().date().isoformat()
+        return f"race_week:{next_race.round if next_race else None}:{today}"
 
-        for race in races:
-            date = race.get("date")
-            time = race.get("time") or "00:00:00Z"
-            dt_str = f"{date}T{time}".replace("Z", "+00:00")
-            try:
-                dt = datetime.datetime.fromisoformat(dt_str)
-            except ValueError:
-                continue
-            if dt > now:
-                return dt, race
-        return None, None
+    def _section(self, data):
+        _, race = self._get_next_race()
+        return race.as_ergast() if race else None
 
     @property
     def is_on(self):
+        return self.state
+
+    def _compute_state(self):
+        # For compatibility, state returns True/False (not "on"/"off")
         next_race_dt, _ = self._get_next_race()
         if not next_race_dt:
             return False
@@ -548,13 +539,7 @@ class F1RaceWeekSensor(CoordinatorEntity, BinarySensorEntity):
         end_of_week = start_of_week + datetime.timedelta(days=6, hours=23, minutes=59, seconds=59)
         return start_of_week.date() <= next_race_dt.date() <= end_of_week.date()
 
-    @property
-    def state(self):
-        # For compatibility, state returns True/False (not "on"/"off")
-        return self.is_on
-
-    @property
-    def extra_state_attributes(self):
+    def _compute_attributes(self):
         next_race_dt, race = self._get_next_race()
         now = datetime.datetime.now(datetime.timezone.utc)
         days = None
@@ -562,8 +547,332 @@ class F1RaceWeekSensor(CoordinatorEntity, BinarySensorEntity):
         if next_race_dt:
             delta = next_race_dt.date() - now.date()
             days = delta.days
-            race_name = race.get("raceName") if race else None
+            race_name = race.name if race else None
         return {
             "days_until_next_race": days,
             "next_race_name": race_name
         }
+
+
+class F1CurrentSessionSensor(F1CoordinatorEntity, SensorEntity):
+    """The session running now according to the schedule, or "none"."""
+
+    _boundaries = (BOUNDARY_SESSION_START, BOUNDARY_SESSION_END)
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_options = [*SESSION_DURATIONS, "none"]
+
+    def _section_key(self):
+        schedule = self.coordinator.schedule
+        current = schedule.current_session()
+        upcoming = schedule.next_session()
+        return (
+            f"current_session:{current.round if current else None}:{current.kind if current else None}:"
+            f"{upcoming.round if upcoming else None}:{upcoming.kind if upcoming else None}"
+        )
+
+    def _section(self, data):
+        schedule = self.coordinator.schedule
+        current = schedule.current_session()
+        upcoming = schedule.next_session()
+        return [
+            (session.kind, session.round, session.race.name, session.start.isoformat()) if session else None
+            for session in (current, upcoming)
+        ]
+
+    def _compute_state(self):
+        current = self.coordinator.schedule.current_session()
+        return current.kind if current else "none"
+
+    def _compute_attributes(self):
+        schedule = self.coordinator.schedule
+        current = schedule.current_session()
+        upcoming = schedule.next_session()
+        return {
+            "round": current.round if current else None,
+            "race_name": current.race.name if current else None,
+            "session_start": current.start.isoformat() if current else None,
+            "session_end": current.end.isoformat() if current else None,
+            "next_session": upcoming.kind if upcoming else None,
+            "next_session_start": upcoming.start.isoformat() if upcoming else None,
+            "next_session_race_name": upcoming.race.name if upcoming else None,
+        }
+
+
+class F1LiveEntity(F1CoordinatorEntity):
+    """Sensor fed by the live timing stream; writes only when its topics changed."""
+
+    # Topics of the live session this entity reads.
+    _topics = ()
+    # Attributes updated many times a session; the recorder would store each.
+    _unrecorded_attributes = HEAVY_ATTRIBUTES | {"positions", "messages"}
+
+    def _update_token(self):
+        coordinator = self.coordinator
+        versions = coordinator.session.versions
+        return coordinator.connected, tuple(versions.get(topic) for topic in self._topics)
+
+    def _session_attributes(self):
+        info = self.coordinator.session.session_info
+        return {
+            "connected": self.coordinator.connected,
+            "session_name": info.get("Name"),
+            "meeting_name": (info.get("Meeting") or {}).get("Name"),
+        }
+
+
+class F1LiveTrackStatusSensor(F1LiveEntity, SensorEntity):
+    """Track status (AllClear, Yellow, SCDeployed, Red, ...) during a session."""
+
+    _topics = ("TrackStatus", "SessionInfo")
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:flag-checkered"
+
+    def _compute_state(self):
+        return self.coordinator.session.track_status.get("Message")
+
+    def _compute_attributes(self):
+        return {
+            **self._session_attributes(),
+            "status": self.coordinator.session.track_status.get("Status"),
+        }
+
+
+class F1LivePositionsSensor(F1LiveEntity, SensorEntity):
+    """Running order during a session; the state is the leader's code."""
+
+    _topics = ("TimingData", "DriverList", "LapCount", "SessionInfo")
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:format-list-numbered"
+
+    def _compute_state(self):
+        positions = self.coordinator.session.positions()
+        return positions[0]["code"] if positions else None
+
+    def _compute_attributes(self):
+        laps = self.coordinator.session.lap_count
+        return {
+            **self._session_attributes(),
+            "lap": laps.get("CurrentLap"),
+            "total_laps": laps.get("TotalLaps"),
+            "positions": self.coordinator.session.positions(),
+        }
+
+
+class F1LiveRaceControlSensor(F1LiveEntity, SensorEntity):
+    """Latest race control message; the attributes keep the most recent ones."""
+
+    _topics = ("RaceControlMessages", "SessionInfo")
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:bullhorn"
+
+    def _compute_state(self):
+        messages = self.coordinator.session.race_control_messages
+        # States are limited to 255 characters.
+        return messages[-1].get("Message", "")[:255] if messages else None
+
+    def _compute_attributes(self):
+        messages = self.coordinator.session.race_control_messages
+        latest = messages[-1] if messages else {}
+        return {
+            **self._session_attributes(),
+            "category": latest.get("Category"),
+            "flag": latest.get("Flag"),
+            "lap": latest.get("Lap"),
+            "utc": latest.get("Utc"),
+            "messages": messages[-LIVE_MESSAGES_KEPT:],
+        }
+
+
+class F1AnalyticsEntity(F1CoordinatorEntity):
+    """Sensor fed by the season analytics; writes only when the parts it reads changed."""
+
+    # Parts of the analytics (SeasonAnalytics.versions) this entity reads.
+    _parts = ()
+    # Per-round tables, one value per driver and round; the recorder would store each.
+    _unrecorded_attributes = HEAVY_ATTRIBUTES | {"drivers", "constructors", "standings", "gaps", "teams", "contenders"}
+
+    def _update_token(self):
+        versions = self.coordinator.analytics.versions
+        return self.coordinator.last_update_success, tuple(versions[part] for part in self._parts)
+
+    def _round_attributes(self):
+        analytics = self.coordinator.analytics
+        return {"season": analytics.season, "round": analytics.rounds[-1] if analytics.rounds else None}
+
+
+class F1PointsProgressionSensor(F1AnalyticsEntity, SensorEntity):
+    """Cumulative championship points per round; the state is the latest round with results."""
+
+    _parts = ("points",)
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:chart-line"
+
+    def _compute_state(self):
+        rounds = self.coordinator.analytics.rounds
+        return rounds[-1] if rounds else None
+
+    def _compute_attributes(self):
+        return {"season": self.coordinator.analytics.season, **self.coordinator.analytics.progression()}
+
+
+class F1ChampionshipGapsSensor(F1AnalyticsEntity, SensorEntity):
+    """Points gaps in the drivers' championship; the state is the gap from first to second."""
+
+    _parts = ("points",)
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:arrow-expand-horizontal"
+
+    def _compute_state(self):
+        standings, _ = self.coordinator.analytics.gaps()
+        return standings[1]["gap_to_next"] if len(standings) > 1 else None
+
+    def _compute_attributes(self):
+        standings, gaps = self.coordinator.analytics.gaps()
+        return {
+            **self._round_attributes(),
+            "leader": standings[0]["driver"] if standings else None,
+            "standings": standings,
+            "gaps": gaps,
+        }
+
+
+class F1TeammateHeadToHeadSensor(F1AnalyticsEntity, SensorEntity):
+    """Race and qualifying head-to-head of every pair of teammates; the state is the number of pairs."""
+
+    _parts = ("points", "duels")
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:account-multiple"
+
+    def _compute_state(self):
+        return len(self.coordinator.analytics.duels)
+
+    def _compute_attributes(self):
+        return {**self._round_attributes(), "teams": self.coordinator.analytics.head_to_head()}
+
+
+class F1TitleFightSensor(F1AnalyticsEntity, SensorEntity):
+    """Points still available to a driver this season, and who can still catch the leader."""
+
+    _parts = ("points", "remaining")
+
+    def __init__(self, coordinator, sensor_name):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._attr_icon = "mdi:trophy"
+
+    def _compute_state(self):
+        return self.coordinator.analytics.max_points_available
+
+    def _compute_attributes(self):
+        analytics = self.coordinator.analytics
+        contenders = analytics.title_contenders()
+        return {
+            **self._round_attributes(),
+            "remaining_races": analytics.remaining["race"],
+            "remaining_sprints": analytics.remaining["sprint"],
+            "leader": contenders[0]["driver"] if contenders else None,
+            # Nobody else can reach the leader's points any more.
+            "decided": len(contenders) == 1,
+            "contenders": contenders,
+        }
+
+
+class F1EndpointDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Request statistics of one endpoint; the state is the latest request latency.
+
+    Attributes also list the serialized attribute size of every sensor of
+    the entry that reads this endpoint.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:speedometer"
+    _unrecorded_attributes = frozenset({"latency_histogram", "attribute_bytes"})
+
+    def __init__(self, coordinator, sensor_name, entities):
+        super().__init__(coordinator)
+        self._attr_name = sensor_name
+        self._attr_unique_id = f"{sensor_name}_unique"
+        self._entities = entities
+
+    @property
+    def available(self):
+        # Failures are what this sensor is for.
+        return True
+
+    @property
+    def native_value(self):
+        latency = self.coordinator.stats.last_latency
+        return round(latency * 1000, 1) if latency is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        coordinator = self.coordinator
+        limiter = coordinator.client.limiter(coordinator.key)
+        return {
+            "endpoint": coordinator.key,
+            "stale": coordinator.stale,
+            # Requests of every endpoint waiting for this host's budget.
+            "host_queue_depth": limiter.queue_depth if limiter is not None else None,
+            **coordinator.stats.as_dict(),
+            "attribute_bytes": {
+                entity.entity_id: entity.attributes_size()
+                for entity in self._entities.values()
+                if entity.coordinator is coordinator and entity.hass is not None
+            },
+        }
+
+
+SENSOR_TYPES = {
+    "next_race": F1NextRaceSensor,
+    "current_season": F1CurrentSeasonSensor,
+    "driver_standings": F1DriverStandingsSensor,
+    "constructor_standings": F1ConstructorStandingsSensor,
+    "weather": F1WeatherSensor,
+    "last_race_results": F1LastRaceSensor,
+    "last_qualifying_results": F1LastQualifyingSensor,
+    "season_results": F1SeasonResultsSensor,
+    "sprint_results": F1SprintResultsSensor,
+    "race_week": F1RaceWeekSensor,
+    "current_session": F1CurrentSessionSensor,
+    "live_track_status": F1LiveTrackStatusSensor,
+    "live_positions": F1LivePositionsSensor,
+    "live_race_control": F1LiveRaceControlSensor,
+    "points_progression": F1PointsProgressionSensor,
+    "championship_gaps": F1ChampionshipGapsSensor,
+    "teammate_head_to_head": F1TeammateHeadToHeadSensor,
+    "title_fight": F1TitleFightSensor,
+}
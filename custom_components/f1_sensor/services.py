@@ -0,0 +1,47 @@
+"""Services of the F1 integration."""
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import DOMAIN, SENSOR_ENDPOINTS
+from .datasets import DATASETS
+
+SERVICE_GET_DATASET = "get_dataset"
+
+GET_DATASET_SCHEMA = vol.Schema({vol.Required("dataset"): vol.In(list(DATASETS))})
+
+
+def _find_coordinator(hass: HomeAssistant, endpoint):
+    for data in hass.data.get(DOMAIN, {}).values():
+        coordinator = data["coordinators"].get(endpoint)
+        if coordinator is not None and coordinator.data is not None:
+            return coordinator
+    return None
+
+
+@callback
+def async_setup_services(hass: HomeAssistant):
+    """Register the services; they serve from the in-memory coordinator data."""
+
+    async def _async_get_dataset(call: ServiceCall):
+        dataset = call.data["dataset"]
+        coordinator = _find_coordinator(hass, SENSOR_ENDPOINTS[dataset][-1])
+        if coordinator is None:
+            raise ServiceValidationError(
+                f"No data for {dataset}; enable its sensor in an F1 entry first"
+            )
+        return {
+            "dataset": dataset,
+            "stale": coordinator.stale,
+            "last_fetched": coordinator.last_fetched.isoformat() if coordinator.last_fetched else None,
+            **DATASETS[dataset](coordinator.model),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DATASET,
+        _async_get_dataset,
+        schema=GET_DATASET_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
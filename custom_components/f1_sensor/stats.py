@@ -0,0 +1,84 @@
+"""Request, decode and write statistics kept per coordinator."""
+from bisect import bisect_left
+
+from homeassistant.util import dt as dt_util
+
+# Upper bounds of the request latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class EndpointStats:
+    """Counters for the requests of one coordinator, cumulative since it started.
+
+    ``requests`` counts every attempt, ``retries`` the attempts after the
+    first, ``rate_limited`` the 429 responses and ``errors`` the requests
+    that still failed after all of them. ``queue_time_total`` is the time
+    spent waiting for the host's request budget.
+    A response is a cache hit when it was a 304 or a 200 with a body
+    identical to the one already held.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.queue_time_total = 0.0
+        self.errors = 0
+        self.responses = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.bytes_received = 0
+        self.bytes_saved = 0
+        self.decode_time_total = 0.0
+        self.decode_time_saved = 0.0
+        self.last_decode_time = None
+        self.last_latency = None
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.skipped_writes = 0
+        self.last_success = None
+        self.last_error = None
+
+    def record_response(self, latency, size):
+        self.responses += 1
+        self.bytes_received += size
+        self.last_latency = latency
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.last_success = dt_util.utcnow()
+
+    def record_error(self, error):
+        self.errors += 1
+        self.last_error = str(error)
+
+    @property
+    def cache_hit_ratio(self):
+        if not self.responses:
+            return None
+        return (self.not_modified + self.unchanged) / self.responses
+
+    def as_dict(self):
+        now = dt_util.utcnow()
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "queue_total_s": round(self.queue_time_total, 1),
+            "errors": self.errors,
+            "responses": self.responses,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 3) if self.responses else None,
+            "bytes_received": self.bytes_received,
+            "bytes_saved": self.bytes_saved,
+            "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            "latency_histogram": {
+                **{f"<={bound}s": count for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)},
+                f">{LATENCY_BUCKETS[-1]}s": self.latency_buckets[-1],
+            },
+            "last_decode_ms": round(self.last_decode_time * 1000, 1) if self.last_decode_time is not None else None,
+            "decode_total_ms": round(self.decode_time_total * 1000, 1),
+            "decode_saved_ms": round(self.decode_time_saved * 1000, 1),
+            "skipped_writes": self.skipped_writes,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_success_age_s": round((now - self.last_success).total_seconds()) if self.last_success else None,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,119 @@
+"""met.no forecast coordinators shared by every weather sensor."""
+from bisect import bisect_left
+import datetime
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .api import async_get_client
+from .const import (
+    WEATHER_MAX_INTERVAL,
+    WEATHER_MIN_INTERVAL,
+    WEATHER_URL,
+    WEATHER_USER_AGENT,
+)
+from .coordinator import F1DataCoordinator, async_acquire_coordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def location_key(lat, lon):
+    """Round a circuit location so nearby requests share one forecast."""
+    try:
+        return round(float(lat), 2), round(float(lon), 2)
+    except (TypeError, ValueError):
+        return None
+
+
+class Forecast:
+    """Forecast timeseries with its timestamps parsed once and kept sorted."""
+
+    __slots__ = ("times", "entries")
+
+    def __init__(self, times, entries):
+        self.times = times
+        self.entries = entries
+
+    @classmethod
+    def from_data(cls, data):
+        parsed = []
+        for entry in (data or {}).get("properties", {}).get("timeseries", []):
+            try:
+                when = datetime.datetime.fromisoformat(entry["time"].replace("Z", "+00:00"))
+            except (KeyError, AttributeError, ValueError):
+                continue
+            parsed.append((when, entry))
+        parsed.sort(key=lambda item: item[0])
+        return cls([when for when, _ in parsed], [entry for _, entry in parsed])
+
+    def as_payload(self):
+        return {"properties": {"timeseries": self.entries}}
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def current(self):
+        return self.entries[0] if self.entries else None
+
+    def nearest_same_day(self, when):
+        """Return the entry closest to ``when`` on the same UTC date, if any."""
+        i = bisect_left(self.times, when)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(self.times) and self.times[j].date() == when.date():
+                if best is None or abs(self.times[j] - when) < abs(self.times[best] - when):
+                    best = j
+        return self.entries[best] if best is not None else None
+
+
+@callback
+def async_acquire_weather(hass: HomeAssistant, location):
+    """Return the forecast coordinator for ``location``, shared across config entries."""
+    lat, lon = location
+    return async_acquire_coordinator(
+        hass, WEATHER_URL.format(lat=lat, lon=lon), lambda: F1WeatherCoordinator(hass, location)
+    )
+
+
+class F1WeatherCoordinator(F1DataCoordinator):
+    """Forecast for one circuit, refetched only once met.no says it expired.
+
+    Requests carry met.no's validators, so a refresh after ``Expires`` that
+    finds an unchanged forecast costs a 304 and no decode.
+    """
+
+    headers = {"User-Agent": WEATHER_USER_AGENT}
+
+    def __init__(self, hass: HomeAssistant, location):
+        lat, lon = location
+        super().__init__(
+            hass,
+            async_get_client(hass),
+            WEATHER_URL.format(lat=lat, lon=lon),
+            f"F1 Weather {lat},{lon}",
+            store_key=f"weather_{lat}_{lon}",
+        )
+        self.location = location
+
+    def _parse(self, data):
+        return Forecast.from_data(data)
+
+    @property
+    def forecast(self):
+        return self.model
+
+    def _update_poll_interval(self):
+        if self.expires is None:
+            self.update_interval = WEATHER_MAX_INTERVAL
+            return
+        remaining = self.expires - dt_util.utcnow()
+        self.update_interval = max(WEATHER_MIN_INTERVAL, min(remaining, WEATHER_MAX_INTERVAL))
+
+    async def _async_start(self):
+        if await self.async_restore() and self.expires and self.expires > dt_util.utcnow():
+            _LOGGER.debug("Using cached forecast for %s until %s", self.location, self.expires)
+            self.stale = False
+            self._update_poll_interval()
+            return
+        await self.async_refresh()